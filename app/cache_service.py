@@ -7,6 +7,8 @@ and use native DATE / NUMERIC types instead of TEXT.
 """
 
 import logging
+import time
+from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
@@ -18,18 +20,97 @@ logger = logging.getLogger(__name__)
 # Cache data older than this many days
 CACHE_THRESHOLD_DAYS = 2
 
+# How long a computed cutoff date is reused before date.today() is re-read.
+_CUTOFF_TTL_SECONDS = 60.0
+
+# Batch cache writes run as one transaction whose COMMIT doesn't wait for the
+# WAL flush. Everything here can be re-fetched from yfinance, so losing the
+# last few hundred ms of writes on a server crash is harmless.
+_ASYNC_COMMIT_SQL = "SET LOCAL synchronous_commit TO OFF"
+
+
+_SELECT_PORTFOLIO_VALUES_SQL = """SELECT date, total_value, investment_value, cost_basis,
+                                         COALESCE(cash_value, 0)
+                                  FROM portfolio_values"""
+
+
+def _portfolio_value_row(cursor):
+    """psycopg row factory: build the (date, values-dict) pair for each row.
+
+    The dict is filled straight from the row values as psycopg loads them, so
+    callers can dict() the rows without another pass over the result.
+    """
+    def make_row(values):
+        value_date, total, investment, cost, cash = values
+        return value_date, {
+            "total_value": total,
+            "investment_value": investment,
+            "cost_basis": cost,
+            "cash_value": cash,
+        }
+    return make_row
+
 
 class CacheService:
     """Postgres-based cache for historical price data."""
 
+    # Hot lookups, executed with prepare=True so each pooled connection parses
+    # and plans them once and reuses the server-side prepared statement.
+    _GET_PRICE_SQL = (
+        "SELECT close_price FROM historical_prices WHERE symbol = %s AND date = %s"
+    )
+    _GET_PRICES_SQL = """SELECT date, close_price FROM historical_prices
+                         WHERE symbol = %s AND date >= %s AND date <= %s"""
+    _GET_PRICES_MULTI_SQL = """SELECT symbol, date, close_price FROM historical_prices
+                               WHERE symbol = ANY(%s) AND date >= %s AND date <= %s"""
+    _GET_INTRADAY_SQL = """SELECT time, price FROM intraday_prices
+                           WHERE symbol = %s AND date = %s AND interval = %s
+                           ORDER BY time"""
+
+    # Upserts only rewrite a row when its value actually changed. Re-caching
+    # the same history (the common case on every refresh) then touches no
+    # tuples and writes no WAL, without a SELECT-then-diff round trip.
+    _UPSERT_PRICE_SQL = """INSERT INTO historical_prices (symbol, date, close_price)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (symbol, date) DO UPDATE SET close_price = EXCLUDED.close_price
+        WHERE historical_prices.close_price IS DISTINCT FROM EXCLUDED.close_price"""
+    _UPSERT_VALUE_SQL = """INSERT INTO portfolio_values
+            (date, total_value, investment_value, cost_basis, cash_value)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (date) DO UPDATE SET
+            total_value = EXCLUDED.total_value,
+            investment_value = EXCLUDED.investment_value,
+            cost_basis = EXCLUDED.cost_basis,
+            cash_value = EXCLUDED.cash_value
+        WHERE (portfolio_values.total_value, portfolio_values.investment_value,
+               portfolio_values.cost_basis, portfolio_values.cash_value)
+            IS DISTINCT FROM (EXCLUDED.total_value, EXCLUDED.investment_value,
+                              EXCLUDED.cost_basis, EXCLUDED.cash_value)"""
+    _UPSERT_INTRADAY_SQL = """INSERT INTO intraday_prices (symbol, date, time, interval, price)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (symbol, date, time, interval) DO UPDATE SET price = EXCLUDED.price
+        WHERE intraday_prices.price IS DISTINCT FROM EXCLUDED.price"""
+
     def __init__(self, db_path=None):
         # db_path kept for backwards compatibility; ignored (Postgres is used).
         # Schema is applied at app startup via app.db.init_schema().
-        pass
+        # (cutoff, time.monotonic() when computed); see _get_cache_cutoff_date.
+        self._cutoff: Optional[tuple[date, float]] = None
 
     def _get_cache_cutoff_date(self) -> date:
-        """Get the cutoff date for caching (2 days ago)."""
-        return date.today() - timedelta(days=CACHE_THRESHOLD_DAYS)
+        """Get the cutoff date for caching (2 days ago).
+
+        Reused for up to _CUTOFF_TTL_SECONDS so per-date checks don't each
+        re-read the clock. Just after midnight the cutoff can lag a day for
+        that long, which only makes fewer dates cacheable.
+        """
+        now = time.monotonic()
+        cached = self._cutoff
+        if cached is not None and now - cached[1] < _CUTOFF_TTL_SECONDS:
+            return cached[0]
+        cutoff = date.today() - timedelta(days=CACHE_THRESHOLD_DAYS)
+        self._cutoff = (cutoff, now)
+        return cutoff
 
     def is_cacheable_date(self, check_date: date) -> bool:
         """Check if a date is old enough to be cached."""
@@ -42,10 +123,9 @@ class CacheService:
         if not self.is_cacheable_date(price_date):
             return None
 
-        with get_pool().connection() as conn:
-            row = conn.execute(
-                "SELECT close_price FROM historical_prices WHERE symbol = %s AND date = %s",
-                (symbol, price_date),
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            row = cur.execute(
+                self._GET_PRICE_SQL, (symbol, price_date), prepare=True
             ).fetchone()
         return row[0] if row else None
 
@@ -58,13 +138,39 @@ class CacheService:
         if start_date > effective_end:
             return {}
 
-        with get_pool().connection() as conn:
-            rows = conn.execute(
-                """SELECT date, close_price FROM historical_prices
-                   WHERE symbol = %s AND date >= %s AND date <= %s""",
-                (symbol, start_date, effective_end),
-            ).fetchall()
-        return {r[0]: r[1] for r in rows}
+        # psycopg's C loaders already produce date/Decimal; rows are 2-tuples,
+        # so dict() builds the mapping straight off the cursor — no Python
+        # loop and no intermediate fetchall() list.
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            return dict(cur.execute(
+                self._GET_PRICES_SQL, (symbol, start_date, effective_end), prepare=True
+            ))
+
+    def get_historical_prices_multi(
+        self, symbols: list[str], start_date: date, end_date: date
+    ) -> dict[str, dict[date, Decimal]]:
+        """Get cached historical prices for several symbols in one query.
+
+        Same date window as get_historical_prices. Symbols with no cached
+        rows are absent from the result.
+        """
+        cutoff = self._get_cache_cutoff_date()
+        effective_end = min(end_date, cutoff - timedelta(days=1))
+        if not symbols or start_date > effective_end:
+            return {}
+
+        # symbol = ANY(array) keeps the statement text fixed for any number of
+        # symbols, so it can be prepared once like the single-symbol lookup.
+        grouped: defaultdict[str, dict[date, Decimal]] = defaultdict(dict)
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                self._GET_PRICES_MULTI_SQL,
+                (list(symbols), start_date, effective_end),
+                prepare=True,
+            )
+            for symbol, price_date, price in cur:
+                grouped[symbol][price_date] = price
+        return dict(grouped)
 
     def save_historical_price(self, symbol: str, price_date: date, price: Decimal) -> bool:
         """Save a historical price to cache. Returns False if too recent to cache."""
@@ -72,12 +178,7 @@ class CacheService:
             return False
 
         with get_pool().connection() as conn:
-            conn.execute(
-                """INSERT INTO historical_prices (symbol, date, close_price)
-                   VALUES (%s, %s, %s)
-                   ON CONFLICT (symbol, date) DO UPDATE SET close_price = EXCLUDED.close_price""",
-                (symbol, price_date, price),
-            )
+            conn.execute(self._UPSERT_PRICE_SQL, (symbol, price_date, price))
             conn.commit()
         return True
 
@@ -89,13 +190,9 @@ class CacheService:
             return 0
 
         with get_pool().connection() as conn:
+            conn.execute(_ASYNC_COMMIT_SQL)
             with conn.cursor() as cur:
-                cur.executemany(
-                    """INSERT INTO historical_prices (symbol, date, close_price)
-                       VALUES (%s, %s, %s)
-                       ON CONFLICT (symbol, date) DO UPDATE SET close_price = EXCLUDED.close_price""",
-                    cacheable,
-                )
+                cur.executemany(self._UPSERT_PRICE_SQL, cacheable)
             conn.commit()
 
         logger.info(f"Cached {len(cacheable)} historical prices for {symbol}")
@@ -109,19 +206,11 @@ class CacheService:
             return None
 
         with get_pool().connection() as conn:
-            row = conn.execute(
-                """SELECT total_value, investment_value, cost_basis, cash_value
-                   FROM portfolio_values WHERE date = %s""",
-                (value_date,),
-            ).fetchone()
-        if row:
-            return {
-                "total_value": row[0],
-                "investment_value": row[1],
-                "cost_basis": row[2],
-                "cash_value": row[3] if row[3] is not None else Decimal("0"),
-            }
-        return None
+            with conn.cursor(row_factory=_portfolio_value_row) as cur:
+                row = cur.execute(
+                    _SELECT_PORTFOLIO_VALUES_SQL + " WHERE date = %s", (value_date,)
+                ).fetchone()
+        return row[1] if row else None
 
     def get_portfolio_values(self, start_date: date, end_date: date) -> dict[date, dict]:
         """Get cached portfolio values for a date range."""
@@ -131,20 +220,11 @@ class CacheService:
             return {}
 
         with get_pool().connection() as conn:
-            rows = conn.execute(
-                """SELECT date, total_value, investment_value, cost_basis, cash_value
-                   FROM portfolio_values WHERE date >= %s AND date <= %s""",
-                (start_date, effective_end),
-            ).fetchall()
-        return {
-            r[0]: {
-                "total_value": r[1],
-                "investment_value": r[2],
-                "cost_basis": r[3],
-                "cash_value": r[4] if r[4] is not None else Decimal("0"),
-            }
-            for r in rows
-        }
+            with conn.cursor(row_factory=_portfolio_value_row) as cur:
+                return dict(cur.execute(
+                    _SELECT_PORTFOLIO_VALUES_SQL + " WHERE date >= %s AND date <= %s",
+                    (start_date, effective_end),
+                ))
 
     def save_portfolio_value(
         self,
@@ -160,14 +240,7 @@ class CacheService:
 
         with get_pool().connection() as conn:
             conn.execute(
-                """INSERT INTO portfolio_values
-                       (date, total_value, investment_value, cost_basis, cash_value)
-                   VALUES (%s, %s, %s, %s, %s)
-                   ON CONFLICT (date) DO UPDATE SET
-                       total_value = EXCLUDED.total_value,
-                       investment_value = EXCLUDED.investment_value,
-                       cost_basis = EXCLUDED.cost_basis,
-                       cash_value = EXCLUDED.cash_value""",
+                self._UPSERT_VALUE_SQL,
                 (value_date, total_value, investment_value, cost_basis, cash_value),
             )
             conn.commit()
@@ -191,18 +264,9 @@ class CacheService:
             return 0
 
         with get_pool().connection() as conn:
+            conn.execute(_ASYNC_COMMIT_SQL)
             with conn.cursor() as cur:
-                cur.executemany(
-                    """INSERT INTO portfolio_values
-                           (date, total_value, investment_value, cost_basis, cash_value)
-                       VALUES (%s, %s, %s, %s, %s)
-                       ON CONFLICT (date) DO UPDATE SET
-                           total_value = EXCLUDED.total_value,
-                           investment_value = EXCLUDED.investment_value,
-                           cost_basis = EXCLUDED.cost_basis,
-                           cash_value = EXCLUDED.cash_value""",
-                    cacheable,
-                )
+                cur.executemany(self._UPSERT_VALUE_SQL, cacheable)
             conn.commit()
 
         logger.info(f"Cached {len(cacheable)} portfolio values")
@@ -215,14 +279,13 @@ class CacheService:
 
     def get_intraday_prices(self, symbol: str, date_str: str, interval: str) -> list[dict]:
         """Return cached intraday bars for a symbol/date/interval, or [] if not cached."""
-        with get_pool().connection() as conn:
-            rows = conn.execute(
-                """SELECT time, price FROM intraday_prices
-                   WHERE symbol = %s AND date = %s AND interval = %s
-                   ORDER BY time""",
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                self._GET_INTRADAY_SQL,
                 (symbol, date.fromisoformat(date_str), interval),
-            ).fetchall()
-        return [{"time": r[0], "date": date_str, "price": r[1]} for r in rows]
+                prepare=True,
+            )
+            return [{"time": t, "date": date_str, "price": p} for t, p in cur]
 
     def has_intraday_prices(self, symbol: str, date_str: str, interval: str) -> bool:
         """Return True if we have any cached bars for this symbol/date/interval."""
@@ -243,14 +306,9 @@ class CacheService:
         d = date.fromisoformat(date_str)
         rows = [(symbol, d, p["time"], interval, p["price"]) for p in prices]
         with get_pool().connection() as conn:
+            conn.execute(_ASYNC_COMMIT_SQL)
             with conn.cursor() as cur:
-                cur.executemany(
-                    """INSERT INTO intraday_prices (symbol, date, time, interval, price)
-                       VALUES (%s, %s, %s, %s, %s)
-                       ON CONFLICT (symbol, date, time, interval)
-                       DO UPDATE SET price = EXCLUDED.price""",
-                    rows,
-                )
+                cur.executemany(self._UPSERT_INTRADAY_SQL, rows)
             conn.commit()
         logger.info(f"Saved {len(rows)} intraday bars for {symbol} {date_str} [{interval}]")
         return len(rows)
@@ -258,13 +316,13 @@ class CacheService:
     def get_intraday_cached_dates(self, symbol: str, interval: str) -> list[str]:
         """Return sorted list of dates (isoformat) with cached intraday data."""
         with get_pool().connection() as conn:
-            rows = conn.execute(
+            cur = conn.execute(
                 """SELECT DISTINCT date FROM intraday_prices
                    WHERE symbol = %s AND interval = %s
                    ORDER BY date""",
                 (symbol, interval),
-            ).fetchall()
-        return [r[0].isoformat() for r in rows]
+            )
+            return [r[0].isoformat() for r in cur]
 
     # --- Utility Methods ---
 
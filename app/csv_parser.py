@@ -1,12 +1,17 @@
 """CSV file parsing for transaction data."""
 
 import csv
-from datetime import datetime
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, TextIO, Union
 
-from .models import ActionType, Transaction
+from .models import ActionType, Transaction, transaction_adapter
 
 
 class CSVParseError(Exception):
@@ -26,15 +31,43 @@ def parse_decimal(value: str) -> Optional[Decimal]:
         raise ValueError(f"Invalid decimal value: {value}")
 
 
-def parse_date(value: str) -> datetime:
-    """Parse a date string in various formats."""
-    formats = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d"]
+# YYYY-MM-DD / YYYY/MM/DD, and MM/DD/YYYY or DD/MM/YYYY. Years are always four
+# digits (as strptime's %Y requires).
+_YMD_RE = re.compile(r"(\d{4})([-/])(\d{1,2})\2(\d{1,2})")
+_XXY_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def parse_date(value: str) -> date:
+    """Parse a date string in various formats.
+
+    Plain YYYY-MM-DD dates (the common case) go through the C
+    ``date.fromisoformat``; it is only given that exact shape, since it also
+    accepts forms such as "20240102" or "2024-W01-1" that aren't valid here.
+    The others are split once by regex instead of trying each strptime format
+    in turn. Slash dates with a trailing year are read as MM/DD/YYYY, falling
+    back to DD/MM/YYYY when that isn't a valid date.
+    """
     value = value.strip()
-    for fmt in formats:
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
         try:
-            return datetime.strptime(value, fmt).date()
+            return date.fromisoformat(value)
         except ValueError:
-            continue
+            pass
+
+    try:
+        match = _YMD_RE.fullmatch(value)
+        if match:
+            year, _, month, day = match.groups()
+            return date(int(year), int(month), int(day))
+        match = _XXY_RE.fullmatch(value)
+        if match:
+            first, second, year = map(int, match.groups())
+            try:
+                return date(year, first, second)
+            except ValueError:
+                return date(year, second, first)
+    except ValueError:
+        pass
     raise ValueError(f"Invalid date format: {value}")
 
 
@@ -48,6 +81,102 @@ def parse_action(value: str) -> ActionType:
         raise ValueError(f"Invalid action '{value}'. Valid actions: {valid_actions}")
 
 
+class _ExcelSemicolon(csv.excel):
+    """Excel dialect with ';' as the delimiter (European locale exports)."""
+    delimiter = ";"
+
+
+_DIALECTS = {",": csv.excel, ";": _ExcelSemicolon, "\t": csv.excel_tab}
+
+
+@lru_cache(maxsize=64)
+def _dialect_from_header(first_line: str) -> Optional[type[csv.Dialect]]:
+    """Pick the dialect by counting candidate delimiters in the header line.
+
+    Returns None when the header is ambiguous (tied or zero counts, or
+    ", "-style spacing that needs skipinitialspace), in which case the caller
+    falls back to csv.Sniffer. Cached because imports of the same export
+    format repeat the same header.
+    """
+    (top, delimiter), (runner_up, _) = sorted(
+        ((first_line.count(d), d) for d in _DIALECTS), reverse=True
+    )[:2]
+    if top == 0 or top == runner_up or f"{delimiter} " in first_line:
+        return None
+    return _DIALECTS[delimiter]
+
+
+def _sniff_dialect(sample: str) -> type[csv.Dialect]:
+    """Slow path: let csv.Sniffer inspect a larger sample."""
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        return csv.excel  # Default to comma-separated
+
+
+_REQUIRED_FIELDS = frozenset({"date", "asset", "action"})
+
+
+def _field(row: list[str], idx: Optional[int]) -> str:
+    """Return the cell at ``idx``, or "" when the column or cell is absent."""
+    if idx is None or idx >= len(row):
+        return ""
+    return row[idx]
+
+
+def _iter_transactions(stream: Iterable[str], dialect: type[csv.Dialect]) -> Iterator[Transaction]:
+    """Yield a Transaction per data row of a CSV text stream.
+
+    Shared by parse_csv_file and parse_csv_stream. Reads the header, checks
+    the required columns, then walks the rows positionally; nothing is
+    buffered, so callers may stream instead of building a list.
+
+    Raises:
+        CSVParseError: On missing columns or an invalid row
+    """
+    # Module globals used per row, bound as locals for the hot loop.
+    _validate, _field_, _date, _action, _decimal = (
+        transaction_adapter.validate_python, _field, parse_date, parse_action, parse_decimal
+    )
+
+    reader = csv.reader(stream, dialect=dialect)
+    header = next(reader, None)
+
+    # Positional reader: no per-row dict, columns are looked up once. Field
+    # names are normalized (lowercase, strip whitespace) straight into the
+    # index, whose keys double as the field set for the required check.
+    col_idx = {name.lower().strip(): i for i, name in enumerate(header or ())}
+    missing = _REQUIRED_FIELDS.difference(col_idx)
+    if missing:
+        raise CSVParseError(f"Missing required columns: {set(missing)}")
+
+    i_date, i_asset, i_action = col_idx["date"], col_idx["asset"], col_idx["action"]
+    i_amount, i_quantity, i_price = (
+        col_idx.get("amount"), col_idx.get("quantity"), col_idx.get("ave_price")
+    )
+    i_source, i_comment = col_idx.get("source"), col_idx.get("comment")
+
+    # Blank lines are skipped (as DictReader did) and not counted.
+    rows = (row for row in reader if row)
+    for row_num, row in enumerate(rows, start=2):  # Start at 2 (header is row 1)
+        try:
+            transaction = _validate({
+                "date": _date(_field_(row, i_date)),
+                "asset": _field_(row, i_asset).strip(),
+                "action": _action(_field_(row, i_action)),
+                "amount": _decimal(_field_(row, i_amount)),
+                "quantity": _decimal(_field_(row, i_quantity)),
+                "ave_price": _decimal(_field_(row, i_price)),
+                "source": _field_(row, i_source).strip() or None,
+                "comment": _field_(row, i_comment).strip() or None,
+            })
+        except ValueError as e:
+            raise CSVParseError(str(e), row_num)
+        except Exception as e:
+            raise CSVParseError(f"Error parsing row: {e}", row_num)
+        yield transaction
+
+
 def parse_csv_file(file_path: Path) -> list[Transaction]:
     """Parse a CSV file and return a list of transactions.
 
@@ -60,106 +189,91 @@ def parse_csv_file(file_path: Path) -> list[Transaction]:
     Raises:
         CSVParseError: If the file cannot be parsed
     """
-    transactions = []
-
     if not file_path.exists():
         raise CSVParseError(f"File not found: {file_path}")
 
     try:
         with open(file_path, "r", encoding="utf-8-sig") as f:
-            # Try to detect delimiter
-            sample = f.read(4096)
-            f.seek(0)
-
-            # Use csv.Sniffer to detect dialect
-            try:
-                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
-            except csv.Error:
-                dialect = csv.excel  # Default to comma-separated
-
-            reader = csv.DictReader(f, dialect=dialect)
-
-            # Normalize field names (lowercase, strip whitespace)
-            if reader.fieldnames:
-                reader.fieldnames = [name.lower().strip() for name in reader.fieldnames]
-
-            required_fields = {"date", "asset", "action"}
-            if not reader.fieldnames or not required_fields.issubset(set(reader.fieldnames)):
-                missing = required_fields - set(reader.fieldnames or [])
-                raise CSVParseError(f"Missing required columns: {missing}")
-
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                try:
-                    transaction = Transaction(
-                        date=parse_date(row.get("date", "")),
-                        asset=row.get("asset", "").strip(),
-                        action=parse_action(row.get("action", "")),
-                        amount=parse_decimal(row.get("amount", "")),
-                        quantity=parse_decimal(row.get("quantity", "")),
-                        ave_price=parse_decimal(row.get("ave_price", "")),
-                        source=row.get("source", "").strip() or None,
-                        comment=row.get("comment", "").strip() or None,
-                    )
-                    transactions.append(transaction)
-                except ValueError as e:
-                    raise CSVParseError(str(e), row_num)
-                except Exception as e:
-                    raise CSVParseError(f"Error parsing row: {e}", row_num)
+            return _parse_text_stream(f)
 
     except UnicodeDecodeError:
         raise CSVParseError("File encoding error. Please use UTF-8 encoding.")
     except csv.Error as e:
         raise CSVParseError(f"CSV format error: {e}")
 
-    return transactions
 
+def parse_csv_stream(stream: BinaryIO) -> list[Transaction]:
+    """Parse CSV transactions from a seekable binary stream (e.g. an upload).
 
-def parse_csv_content(content: str) -> list[Transaction]:
-    """Parse CSV content from a string.
+    The bytes are decoded incrementally as rows are read, so the payload is
+    never held in memory as one ``bytes`` or ``str``.
 
     Args:
-        content: CSV content as string
+        stream: Seekable binary file object positioned at the start of the CSV
 
     Returns:
         List of Transaction objects
+
+    Raises:
+        CSVParseError: If the content cannot be parsed
     """
-    import io
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    try:
+        return _parse_text_stream(text)
+    except UnicodeDecodeError:
+        raise CSVParseError("File encoding error. Please use UTF-8 encoding.")
+    except csv.Error as e:
+        raise CSVParseError(f"CSV format error: {e}")
+    finally:
+        # Hand the binary stream back to the caller open.
+        text.detach()
 
-    transactions = []
 
-    # Try to detect delimiter
-    try:
-        dialect = csv.Sniffer().sniff(content[:4096], delimiters=",;\t")
-    except csv.Error:
-        dialect = csv.excel
+def _parse_text_stream(f: TextIO) -> list[Transaction]:
+    """Detect the dialect of a seekable text stream, then parse every row."""
+    # Detect the delimiter from the header line; only sniff a larger sample
+    # when that is ambiguous.
+    dialect = _dialect_from_header(f.readline())
+    if dialect is None:
+        f.seek(0)
+        dialect = _sniff_dialect(f.read(4096))
+    f.seek(0)
 
-    reader = csv.DictReader(io.StringIO(content), dialect=dialect)
+    return list(_iter_transactions(f, dialect))
 
-    # Normalize field names
-    if reader.fieldnames:
-        reader.fieldnames = [name.lower().strip() for name in reader.fieldnames]
 
-    required_fields = {"date", "asset", "action"}
-    if not reader.fieldnames or not required_fields.issubset(set(reader.fieldnames)):
-        missing = required_fields - set(reader.fieldnames or [])
-        raise CSVParseError(f"Missing required columns: {missing}")
+def parse_csv_files(
+    paths: Sequence[Path], max_workers: Optional[int] = None
+) -> Iterator[tuple[Path, Union[list[Transaction], CSVParseError]]]:
+    """Parse several CSV files in parallel, one worker process per file.
 
-    for row_num, row in enumerate(reader, start=2):
-        try:
-            transaction = Transaction(
-                date=parse_date(row.get("date", "")),
-                asset=row.get("asset", "").strip(),
-                action=parse_action(row.get("action", "")),
-                amount=parse_decimal(row.get("amount", "")),
-                quantity=parse_decimal(row.get("quantity", "")),
-                ave_price=parse_decimal(row.get("ave_price", "")),
-                source=row.get("source", "").strip() or None,
-                comment=row.get("comment", "").strip() or None,
-            )
-            transactions.append(transaction)
-        except ValueError as e:
-            raise CSVParseError(str(e), row_num)
-        except Exception as e:
-            raise CSVParseError(f"Error parsing row: {e}", row_num)
+    Parsing is CPU-bound (Decimal, date and model validation), so files are
+    spread across processes rather than threads. A single file is parsed
+    in-process.
 
-    return transactions
+    Args:
+        paths: CSV files to parse
+        max_workers: Process count (defaults to one per CPU, capped at len(paths))
+
+    Yields:
+        (path, transactions) for each file in the order of ``paths``, or
+        (path, CSVParseError) for a file that failed to parse. A file's result
+        is yielded as soon as it and every file before it are done, so the
+        caller can consume early files while later ones are still parsing.
+    """
+    if len(paths) <= 1:
+        for path in paths:
+            try:
+                yield path, parse_csv_file(path)
+            except CSVParseError as e:
+                yield path, e
+        return
+
+    workers = min(len(paths), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_csv_file, path) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                yield path, future.result()
+            except CSVParseError as e:
+                yield path, e
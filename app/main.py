@@ -1,30 +1,45 @@
 """FastAPI application entry point."""
 
+import asyncio
+import functools
+import hashlib
 import logging
 import mimetypes
 import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
 from datetime import date as date_type
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Any, Hashable, Iterable, Iterator, Literal, Optional
 from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+import orjson
+from fastapi import FastAPI, File, HTTPException, Query, Response, UploadFile
 from pydantic import BaseModel, ValidationError
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
 
 from . import repository
 from .cache_service import cache_service
-from .csv_parser import CSVParseError, parse_csv_content
+from .csv_parser import CSVParseError, parse_csv_stream
 from .db import init_schema
-from .models import ActionType, Transaction
+from .models import POSITION_ACTIONS, ActionType, Holding, Transaction
 from .portfolio import Portfolio
 from .price_service import price_service
 from .simulator import run_simulation
+from .split_service import split_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,11 +60,33 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Apply DB schema (idempotent) and load portfolio data on startup.
+
+    Then start a task that prewarms the price caches and the holdings and
+    summary responses so the first dashboard load doesn't pay for them. The
+    endpoints compute on a worker thread (see _ttl_cached), so requests are
+    served while the prewarm runs.
+    """
+    if not API_TOKEN:
+        logger.warning("API_TOKEN not set — authentication is DISABLED (dev mode).")
+    init_schema()
+    load_portfolio()
+    prewarm = asyncio.create_task(_prewarm_api_cache())
+    yield
+    prewarm.cancel()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Portfolio Tracker",
     description="Track your investment portfolio with live market data",
     version="1.0.0",
+    # Encode every plain-dict response with orjson instead of stdlib json.
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Mount static files
@@ -61,6 +98,9 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 # Templates
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# The dashboard shell doesn't depend on the request, so render it once up
+# front. (Restart the server to pick up template edits.)
+_INDEX_HTML = templates.get_template("index.html").render()
 
 # --- Auth ---
 # When API_TOKEN is set, every request except the page shell, static assets and
@@ -82,6 +122,23 @@ async def require_token(request: Request, call_next):
     return await call_next(request)
 
 
+@app.middleware("http")
+async def not_modified(request: Request, call_next):
+    """Answer conditional GETs with 304 when the response's ETag is unchanged."""
+    response = await call_next(request)
+    etag = response.headers.get("etag")
+    if_none_match = request.headers.get("if-none-match")
+    if (
+        etag
+        and if_none_match
+        and request.method == "GET"
+        and response.status_code == 200
+        and etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return response
+
+
 @app.get("/healthz")
 @app.get("/api/healthz")
 async def healthz():
@@ -102,129 +159,298 @@ async def service_worker():
         headers={"Service-Worker-Allowed": "/", "Cache-Control": "no-cache"},
     )
 
-# Global portfolio instance (reloaded from CSV files)
+# Global portfolio instance (reloaded from the transactions table)
 portfolio: Optional[Portfolio] = None
+# Serializes rebuilds, so two requests never build the portfolio at once.
+_portfolio_lock = threading.Lock()
+
+class _CacheEntry:
+    """A cached JSON body, its ETag and its expiry on the time.monotonic_ns() clock."""
+    __slots__ = ("expires_ns", "body", "etag")
+
+    def __init__(self, expires_ns: int, body: bytes):
+        self.expires_ns = expires_ns
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+    def response(self) -> Response:
+        # no-cache: browsers may keep the body but must revalidate every time,
+        # so a write is never masked by a stale local copy; unchanged data
+        # costs a 304 (see not_modified).
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, "Cache-Control": "no-cache"},
+        )
+
 
-# API-level response cache
-_api_cache: dict[str, tuple[dict, datetime]] = {}
-_API_TTL = {
-    "holdings": timedelta(seconds=30),
-    "summary": timedelta(seconds=30),
-    "daily-pnl": timedelta(seconds=60),
-    "intraday": timedelta(seconds=30),
-    "intraday-hist": timedelta(hours=12),
-    "intraday-multiday": timedelta(seconds=60),
+# API-level response cache, in least- to most-recently-used order and capped
+# at _API_CACHE_MAXSIZE entries. Bodies are stored already encoded, so a hit
+# returns the bytes as-is instead of re-encoding the payload.
+_api_cache: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+_API_CACHE_MAXSIZE = 64
+# Bumped on every clear. A miss computed across a clear was built from the old
+# portfolio, so it is returned but not cached (see _set_api_cache).
+_api_cache_generation = 0
+# One lock per cache key, so concurrent misses compute a response only once.
+# A key's lock is dropped with its cache entry, or straight away when the miss
+# cached nothing (e.g. the endpoint raised).
+_api_locks: defaultdict[Hashable, asyncio.Lock] = defaultdict(asyncio.Lock)
+_NS_PER_SECOND = 1_000_000_000
+# Response TTLs, pre-scaled to monotonic-clock nanoseconds.
+_API_TTL_NS = {
+    "holdings": 30 * _NS_PER_SECOND,
+    "summary": 30 * _NS_PER_SECOND,
+    "daily-pnl": 60 * _NS_PER_SECOND,
+    "intraday": 30 * _NS_PER_SECOND,
+    "intraday-hist": 12 * 3600 * _NS_PER_SECOND,
+    "intraday-multiday": 60 * _NS_PER_SECOND,
+    # Transactions-only data; every write and reload clears the cache anyway.
+    "sold": 3600 * _NS_PER_SECOND,
 }
+# Rows encoded per chunk when streaming a long list (see _stream_json).
+_STREAM_CHUNK_ROWS = 256
+
+
+def _json_default(obj):
+    """orjson fallback: Decimals go out as floats (as jsonable_encoder did)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 
+def _dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _stream_json(list_key: str, rows: Iterable, extra: Optional[dict] = None) -> StreamingResponse:
+    """Stream ``{list_key: [*rows], **extra}`` as JSON, encoding rows in chunks.
+
+    The full document is never built as one string; the client receives and
+    parses the leading rows while the rest are still being encoded.
+    """
+    def body() -> Iterator[bytes]:
+        yield b"{" + _dumps(list_key) + b":["
+        chunk: list[bytes] = []
+        sep = b""
+        for row in rows:
+            chunk.append(_dumps(row))
+            if len(chunk) == _STREAM_CHUNK_ROWS:
+                yield sep + b",".join(chunk)
+                chunk, sep = [], b","
+        if chunk:
+            yield sep + b",".join(chunk)
+        yield b"]"
+        for key, value in (extra or {}).items():
+            yield b"," + _dumps(key) + b":" + _dumps(value)
+        yield b"}"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _get_api_cache(key: Hashable) -> Optional[Response]:
+    entry = _api_cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic_ns() >= entry.expires_ns:
+        _evict_api_cache(key)
+        return None
+    _api_cache.move_to_end(key)
+    return entry.response()
+
+
+def _set_api_cache(
+    key: Hashable, data: dict, ttl_ns: int, generation: Optional[int] = None
+) -> Response:
+    """Encode ``data`` once, cache the bytes and return them as the response.
+
+    ``generation`` is the _api_cache_generation the computation started in;
+    if the cache has been cleared since, the response is returned uncached.
+
+    Inserting also drops every expired entry and then the least recently
+    used ones beyond _API_CACHE_MAXSIZE, so stale payloads don't linger until
+    their exact key is requested again.
+    """
+    now = time.monotonic_ns()
+    entry = _CacheEntry(now + ttl_ns, _dumps(data))
+    if generation is not None and generation != _api_cache_generation:
+        return entry.response()
+    _api_cache[key] = entry
+    _api_cache.move_to_end(key)
+
+    for stale in [k for k, e in _api_cache.items() if e.expires_ns <= now]:
+        _evict_api_cache(stale)
+    while len(_api_cache) > _API_CACHE_MAXSIZE:
+        _evict_api_cache(next(iter(_api_cache)))
+    return entry.response()
+
+
+def _clear_api_cache() -> None:
+    """Drop every cached response and start a new cache generation."""
+    global _api_cache_generation
+    _api_cache.clear()
+    _api_cache_generation += 1
 
-def _get_api_cache(key: str) -> Optional[dict]:
-    if key in _api_cache:
-        data, cached_at = _api_cache[key]
-        ttl_key = key.split("_")[0]
-        ttl = _API_TTL.get(ttl_key, timedelta(seconds=30))
-        if datetime.now() - cached_at < ttl:
-            return data
-    return None
 
+def _evict_api_cache(key: Hashable) -> None:
+    """Drop a cache entry, and its miss lock unless a request is holding it."""
+    del _api_cache[key]
+    lock = _api_locks.get(key)
+    if lock is not None and not lock.locked():
+        del _api_locks[key]
 
-def _set_api_cache(key: str, data: dict) -> None:
-    _api_cache[key] = (data, datetime.now())
+
+def _ttl_cached(ttl_name: str):
+    """Cache an endpoint's JSON response per query-argument set.
+
+    The TTL is looked up in _API_TTL_NS once, when the endpoint is decorated.
+
+    The wrapped endpoint is a plain (synchronous) function returning a dict.
+    It only runs on a miss, on a worker thread so its blocking price and DB
+    calls don't stall the event loop, and concurrent misses for the same key
+    wait for the first one's result instead of recomputing it. Errors
+    (HTTPException) propagate and are not cached.
+    """
+    ttl_ns = _API_TTL_NS[ttl_name]
+
+    def decorator(endpoint):
+        name = endpoint.__name__
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            # FastAPI always passes parameters by keyword, in signature order.
+            key = (name, *kwargs.values())
+            cached = _get_api_cache(key)
+            if cached is not None:
+                return cached
+            lock = _api_locks[key]
+            try:
+                async with lock:
+                    # Re-check: another request may have filled it while we waited.
+                    cached = _get_api_cache(key)
+                    if cached is not None:
+                        return cached
+                    generation = _api_cache_generation
+                    data = await asyncio.to_thread(endpoint, **kwargs)
+                    return _set_api_cache(key, data, ttl_ns, generation)
+            finally:
+                # Nothing cached (the endpoint raised): don't keep the lock
+                # around for a key that may never be requested again.
+                if key not in _api_cache and not lock.locked() and _api_locks.get(key) is lock:
+                    del _api_locks[key]
+
+        return wrapper
+    return decorator
 
 
 def load_portfolio() -> Portfolio:
     """Load portfolio from all transactions stored in Postgres."""
     global portfolio
-    portfolio = Portfolio()
+    with _portfolio_lock:
+        # Built off to the side and swapped in whole: endpoints on worker
+        # threads read the global without the lock.
+        new = Portfolio()
+
+        transactions = repository.get_all_transactions()
+        if transactions:
+            # Building the portfolio looks up splits symbol by symbol; fetch them
+            # all up front in parallel so those lookups are cache hits.
+            split_service.get_splits_for_symbols(
+                [t.asset for t in transactions if t.action in POSITION_ACTIONS]
+            )
+            new.add_transactions(transactions)
+            logger.info(f"Loaded {len(transactions)} transactions from database")
+        else:
+            logger.info("No transactions found in database")
 
-    transactions = repository.get_all_transactions()
-    if transactions:
-        portfolio.add_transactions(transactions)
-        logger.info(f"Loaded {len(transactions)} transactions from database")
-    else:
-        logger.info("No transactions found in database")
+        portfolio = new
+        return new
 
-    return portfolio
 
+def _current_portfolio() -> Portfolio:
+    """Return the loaded portfolio, loading it first if needed.
+
+    Endpoints take this once into a local, so one response never mixes an
+    old and a rebuilt portfolio.
+    """
+    return portfolio if portfolio is not None else load_portfolio()
 
-@app.on_event("startup")
-async def startup_event():
-    """Apply DB schema (idempotent) and load portfolio data on startup."""
-    if not API_TOKEN:
-        logger.warning("API_TOKEN not set — authentication is DISABLED (dev mode).")
-    init_schema()
-    load_portfolio()
+
+async def _prewarm_api_cache() -> None:
+    """Fill the holdings and summary response cache (and the price caches behind it).
+
+    Each endpoint's blocking yfinance and Postgres work runs via
+    asyncio.to_thread inside _ttl_cached; this task only awaits it, so it
+    never holds the event loop. A request arriving mid-prewarm for the same
+    response waits on that key's lock instead of computing it again.
+    """
+    for endpoint in (get_holdings, get_summary):
+        try:
+            await endpoint()
+        except HTTPException as e:
+            logger.warning(f"Prewarming {endpoint.__name__} failed: {e.detail}")
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Serve the main dashboard page."""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(_INDEX_HTML)
+
+
+def _holding_to_dict(h: Holding) -> dict:
+    """Serialize a Holding for the holdings and summary responses."""
+    return {
+        "symbol": h.symbol,
+        "quantity": float(h.quantity),
+        "cost_basis": float(h.cost_basis),
+        "avg_cost": float(h.avg_cost),
+        "current_price": float(h.current_price) if h.current_price is not None else None,
+        "market_value": float(h.market_value) if h.market_value is not None else None,
+        "unrealized_pnl": float(h.unrealized_pnl) if h.unrealized_pnl is not None else None,
+        "pnl_percent": float(h.pnl_percent) if h.pnl_percent is not None else None,
+        "daily_change_percent": float(h.daily_change_percent) if h.daily_change_percent is not None else None,
+        "daily_change_amount": float(h.daily_change_amount) if h.daily_change_amount is not None else None,
+        "holding_days": h.holding_days,
+        "annualized_return": float(h.annualized_return) if h.annualized_return is not None else None,
+        "weighted_annualized_return": float(h.weighted_annualized_return) if h.weighted_annualized_return is not None else None,
+        "long_term_quantity": float(h.long_term_quantity) if h.long_term_quantity is not None else None,
+        "short_term_quantity": float(h.short_term_quantity) if h.short_term_quantity is not None else None,
+        "lt_unrealized_pnl": float(h.lt_unrealized_pnl) if h.lt_unrealized_pnl is not None else None,
+        "st_unrealized_pnl": float(h.st_unrealized_pnl) if h.st_unrealized_pnl is not None else None,
+        "realized_pnl": float(h.realized_pnl) if h.realized_pnl is not None else None,
+        "lt_realized_pnl": float(h.lt_realized_pnl) if h.lt_realized_pnl is not None else None,
+        "st_realized_pnl": float(h.st_realized_pnl) if h.st_realized_pnl is not None else None,
+        "total_pnl": float(h.total_pnl) if h.total_pnl is not None else None,
+        "total_pnl_percent": float(h.total_pnl_percent) if h.total_pnl_percent is not None else None,
+        "ytd_pnl": float(h.ytd_pnl) if h.ytd_pnl is not None else None,
+        "ytd_pnl_percent": float(h.ytd_pnl_percent) if h.ytd_pnl_percent is not None else None,
+        "lt_ytd_pnl": float(h.lt_ytd_pnl) if h.lt_ytd_pnl is not None else None,
+        "st_ytd_pnl": float(h.st_ytd_pnl) if h.st_ytd_pnl is not None else None,
+    }
 
 
 @app.get("/api/holdings")
-async def get_holdings():
+@_ttl_cached("holdings")
+def get_holdings():
     """Get current holdings with live prices."""
-    if portfolio is None:
-        load_portfolio()
-
-    cached = _get_api_cache("holdings")
-    if cached is not None:
-        return cached
+    p = _current_portfolio()
 
     try:
-        holdings = portfolio.get_holdings(fetch_prices=True)
-        result = {
-            "holdings": [
-                {
-                    "symbol": h.symbol,
-                    "quantity": float(h.quantity),
-                    "cost_basis": float(h.cost_basis),
-                    "avg_cost": float(h.avg_cost),
-                    "current_price": float(h.current_price) if h.current_price else None,
-                    "market_value": float(h.market_value) if h.market_value else None,
-                    "unrealized_pnl": float(h.unrealized_pnl) if h.unrealized_pnl else None,
-                    "pnl_percent": float(h.pnl_percent) if h.pnl_percent else None,
-                    "daily_change_percent": float(h.daily_change_percent) if h.daily_change_percent else None,
-                    "daily_change_amount": float(h.daily_change_amount) if h.daily_change_amount else None,
-                    "holding_days": h.holding_days,
-                    "annualized_return": float(h.annualized_return) if h.annualized_return else None,
-                    "weighted_annualized_return": float(h.weighted_annualized_return) if h.weighted_annualized_return else None,
-                    "long_term_quantity": float(h.long_term_quantity) if h.long_term_quantity is not None else None,
-                    "short_term_quantity": float(h.short_term_quantity) if h.short_term_quantity is not None else None,
-                    "lt_unrealized_pnl": float(h.lt_unrealized_pnl) if h.lt_unrealized_pnl is not None else None,
-                    "st_unrealized_pnl": float(h.st_unrealized_pnl) if h.st_unrealized_pnl is not None else None,
-                    "realized_pnl": float(h.realized_pnl) if h.realized_pnl is not None else None,
-                    "lt_realized_pnl": float(h.lt_realized_pnl) if h.lt_realized_pnl is not None else None,
-                    "st_realized_pnl": float(h.st_realized_pnl) if h.st_realized_pnl is not None else None,
-                    "total_pnl": float(h.total_pnl) if h.total_pnl is not None else None,
-                    "total_pnl_percent": float(h.total_pnl_percent) if h.total_pnl_percent is not None else None,
-                    "ytd_pnl": float(h.ytd_pnl) if h.ytd_pnl is not None else None,
-                    "ytd_pnl_percent": float(h.ytd_pnl_percent) if h.ytd_pnl_percent is not None else None,
-                    "lt_ytd_pnl": float(h.lt_ytd_pnl) if h.lt_ytd_pnl is not None else None,
-                    "st_ytd_pnl": float(h.st_ytd_pnl) if h.st_ytd_pnl is not None else None,
-                }
-                for h in holdings
-            ]
-        }
-        _set_api_cache("holdings", result)
-        return result
+        holdings = p.get_holdings(fetch_prices=True)
+        return {"holdings": list(map(_holding_to_dict, holdings))}
     except Exception as e:
         logger.error(f"Error fetching holdings: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/summary")
-async def get_summary():
+@_ttl_cached("summary")
+def get_summary():
     """Get portfolio summary including totals."""
-    if portfolio is None:
-        load_portfolio()
-
-    cached = _get_api_cache("summary")
-    if cached is not None:
-        return cached
+    p = _current_portfolio()
 
     try:
-        summary = portfolio.get_portfolio_summary(fetch_prices=True)
+        summary = p.get_portfolio_summary(fetch_prices=True)
 
         # YTD P&L: change in (investment_value - cost_basis) since Jan 1
         ytd_pnl = 0.0
@@ -233,7 +459,7 @@ async def get_summary():
         ytd_st_pnl = None
         today = market_today()
         jan1 = date_type(today.year, 1, 1)
-        ytd_history = portfolio.get_historical_values(
+        ytd_history = p.get_historical_values(
             start_date=jan1, end_date=today
         )
         if ytd_history and len(ytd_history) >= 1:
@@ -248,7 +474,7 @@ async def get_summary():
 
         # YTD LT/ST P&L: compute LT/ST unrealized P&L at Jan 1, diff against today
         if summary.lt_unrealized_pnl is not None and summary.st_unrealized_pnl is not None:
-            jan1_lt, jan1_st = portfolio.get_lt_st_unrealized_pnl_at_date(jan1)
+            jan1_lt, jan1_st = p.get_lt_st_unrealized_pnl_at_date(jan1)
             ytd_lt_pnl = float(summary.lt_unrealized_pnl) - float(jan1_lt)
             ytd_st_pnl = float(summary.st_unrealized_pnl) - float(jan1_st)
 
@@ -265,42 +491,12 @@ async def get_summary():
             "total_dividends": float(summary.total_dividends),
             "total_fees": float(summary.total_fees),
             "all_time_cost_basis": float(summary.all_time_cost_basis),
-            "weighted_annualized_return": float(summary.weighted_annualized_return) if summary.weighted_annualized_return else None,
+            "weighted_annualized_return": float(summary.weighted_annualized_return) if summary.weighted_annualized_return is not None else None,
             "ytd_pnl": ytd_pnl,
             "ytd_pnl_percent": ytd_pnl_percent,
             "ytd_lt_pnl": ytd_lt_pnl,
             "ytd_st_pnl": ytd_st_pnl,
-            "holdings": [
-                {
-                    "symbol": h.symbol,
-                    "quantity": float(h.quantity),
-                    "cost_basis": float(h.cost_basis),
-                    "avg_cost": float(h.avg_cost),
-                    "current_price": float(h.current_price) if h.current_price else None,
-                    "market_value": float(h.market_value) if h.market_value else None,
-                    "unrealized_pnl": float(h.unrealized_pnl) if h.unrealized_pnl else None,
-                    "pnl_percent": float(h.pnl_percent) if h.pnl_percent else None,
-                    "daily_change_percent": float(h.daily_change_percent) if h.daily_change_percent else None,
-                    "daily_change_amount": float(h.daily_change_amount) if h.daily_change_amount else None,
-                    "holding_days": h.holding_days,
-                    "annualized_return": float(h.annualized_return) if h.annualized_return else None,
-                    "weighted_annualized_return": float(h.weighted_annualized_return) if h.weighted_annualized_return else None,
-                    "long_term_quantity": float(h.long_term_quantity) if h.long_term_quantity is not None else None,
-                    "short_term_quantity": float(h.short_term_quantity) if h.short_term_quantity is not None else None,
-                    "lt_unrealized_pnl": float(h.lt_unrealized_pnl) if h.lt_unrealized_pnl is not None else None,
-                    "st_unrealized_pnl": float(h.st_unrealized_pnl) if h.st_unrealized_pnl is not None else None,
-                    "realized_pnl": float(h.realized_pnl) if h.realized_pnl is not None else None,
-                    "lt_realized_pnl": float(h.lt_realized_pnl) if h.lt_realized_pnl is not None else None,
-                    "st_realized_pnl": float(h.st_realized_pnl) if h.st_realized_pnl is not None else None,
-                    "total_pnl": float(h.total_pnl) if h.total_pnl is not None else None,
-                    "total_pnl_percent": float(h.total_pnl_percent) if h.total_pnl_percent is not None else None,
-                    "ytd_pnl": float(h.ytd_pnl) if h.ytd_pnl is not None else None,
-                    "ytd_pnl_percent": float(h.ytd_pnl_percent) if h.ytd_pnl_percent is not None else None,
-                    "lt_ytd_pnl": float(h.lt_ytd_pnl) if h.lt_ytd_pnl is not None else None,
-                    "st_ytd_pnl": float(h.st_ytd_pnl) if h.st_ytd_pnl is not None else None,
-                }
-                for h in summary.holdings
-            ],
+            "holdings": list(map(_holding_to_dict, summary.holdings)),
             "dividend_summaries": [
                 {
                     "symbol": d.symbol,
@@ -310,7 +506,6 @@ async def get_summary():
                 for d in summary.dividend_summaries
             ],
         }
-        _set_api_cache("summary", result)
         return result
     except Exception as e:
         logger.error(f"Error fetching summary: {e}")
@@ -323,8 +518,7 @@ async def get_performance(
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
 ):
     """Get historical portfolio performance data."""
-    if portfolio is None:
-        load_portfolio()
+    p = _current_portfolio()
 
     try:
         from datetime import datetime
@@ -337,14 +531,17 @@ async def get_performance(
         if end_date:
             end = datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        history = portfolio.get_historical_values(start_date=start, end_date=end)
-        realized_by_year = portfolio.get_realized_pnl_by_year()
-        realized_details_by_year = portfolio.get_realized_details_by_year()
-        return {
-            "performance": history,
-            "realized_by_year": realized_by_year,
-            "realized_details_by_year": realized_details_by_year,
-        }
+        history = p.get_historical_values(start_date=start, end_date=end)
+        realized_by_year = p.get_realized_pnl_by_year()
+        realized_details_by_year = p.get_realized_details_by_year()
+        return _stream_json(
+            "performance",
+            history,
+            {
+                "realized_by_year": realized_by_year,
+                "realized_details_by_year": realized_details_by_year,
+            },
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
     except Exception as e:
@@ -353,27 +550,18 @@ async def get_performance(
 
 
 @app.get("/api/daily-pnl")
-async def get_daily_pnl(num_days: int = 42):
+@_ttl_cached("daily-pnl")
+def get_daily_pnl(num_days: int = 42):
     """Get daily P&L for the last `num_days` days using EST midnight as the daily boundary.
 
     Default 42 days so the 5-week (current + past 4) Daily P&L panel always
     has a full window's worth of data, even when today falls early in the week.
     """
-    if portfolio is None:
-        load_portfolio()
-
-    # Cache is keyed on the endpoint name only, so vary it by num_days.
-    # `_get_api_cache` splits on "_" to look up the TTL, so use "_" not ":" in the suffix.
-    cache_key = f"daily-pnl_{num_days}"
-    cached = _get_api_cache(cache_key)
-    if cached is not None:
-        return cached
+    p = _current_portfolio()
 
     try:
-        data = portfolio.get_daily_pnl_history(num_days=num_days)
-        result = {"daily_pnl": data}
-        _set_api_cache(cache_key, result)
-        return result
+        data = p.get_daily_pnl_history(num_days=num_days)
+        return {"daily_pnl": data}
     except Exception as e:
         logger.error(f"Error fetching daily P&L: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -382,12 +570,11 @@ async def get_daily_pnl(num_days: int = 42):
 @app.get("/api/dividends")
 async def get_dividends():
     """Get dividend summary and history."""
-    if portfolio is None:
-        load_portfolio()
+    p = _current_portfolio()
 
     try:
-        summaries = portfolio.get_dividend_summaries()
-        total = portfolio.get_total_dividends()
+        summaries = p.get_dividend_summaries()
+        total = p.get_total_dividends()
 
         return {
             "total_dividends": float(total),
@@ -406,16 +593,18 @@ async def get_dividends():
 
 
 @app.get("/api/sold")
-async def get_sold_assets():
+@_ttl_cached("sold")
+def get_sold_assets():
     """Get summary of sold assets with realized P&L."""
-    if portfolio is None:
-        load_portfolio()
+    p = _current_portfolio()
 
     try:
-        sold_assets = portfolio.get_sold_assets()
-        total_pnl = sum(s["pnl"] for s in sold_assets)
-        total_proceeds = sum(s["proceeds"] for s in sold_assets)
-        total_cost_basis = sum(s["cost_basis"] for s in sold_assets)
+        sold_assets = p.get_sold_assets()
+        total_pnl = total_proceeds = total_cost_basis = 0
+        for s in sold_assets:
+            total_pnl += s["pnl"]
+            total_proceeds += s["proceeds"]
+            total_cost_basis += s["cost_basis"]
 
         return {
             "sold_assets": sold_assets,
@@ -431,7 +620,7 @@ async def get_sold_assets():
 def _refresh_after_write() -> None:
     """Reload the portfolio and drop the API response cache after a DB write."""
     load_portfolio()
-    _api_cache.clear()
+    _clear_api_cache()
 
 
 class TransactionCreate(BaseModel):
@@ -485,11 +674,9 @@ async def upload_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be a CSV file")
 
     try:
-        content = await file.read()
-        content_str = content.decode("utf-8-sig")
-
-        # Parse + validate, then bulk-insert into Postgres (no file is written).
-        transactions = parse_csv_content(content_str)
+        # Parse + validate straight from the spooled upload (decoded as it is
+        # read), then bulk-insert into Postgres (no file is written).
+        transactions = parse_csv_stream(file.file)
         count = repository.insert_transactions(transactions)
 
         _refresh_after_write()
@@ -500,11 +687,6 @@ async def upload_csv(file: UploadFile = File(...)):
         }
     except CSVParseError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    except UnicodeDecodeError:
-        raise HTTPException(
-            status_code=400,
-            detail="File encoding error. Please use UTF-8 encoding.",
-        )
     except Exception as e:
         logger.error(f"Error uploading file: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -516,7 +698,7 @@ async def reload_portfolio(clear_history_cache: bool = Query(False, description=
     try:
         load_portfolio()
         price_service.clear_cache()
-        _api_cache.clear()
+        _clear_api_cache()
         if clear_history_cache:
             cache_service.clear_cache()
         return {"message": "Portfolio reloaded successfully"}
@@ -562,14 +744,13 @@ async def get_transactions(
     actions: Optional[str] = Query(None, description="Comma-separated action types to filter (e.g. BUY,SELL)"),
 ):
     """Get recent transactions for a specific symbol."""
-    if portfolio is None:
-        load_portfolio()
+    p = _current_portfolio()
 
     try:
         action_filter = {a.strip().upper() for a in actions.split(",")} if actions else None
         txns = sorted(
             [
-                t for t in portfolio._transactions
+                t for t in p._transactions
                 if t.asset == symbol.upper()
                 and (action_filter is None or t.action.value in action_filter)
             ],
@@ -595,17 +776,29 @@ async def get_transactions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _iter_csvs(root: Path) -> Iterator[tuple[str, os.stat_result]]:
+    """Yield (name, stat) for each CSV file directly under ``root``.
+
+    Uses one os.scandir pass and a single stat per file, with no Path object
+    built per entry.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.endswith(".csv") and entry.is_file():
+                yield entry.name, entry.stat()
+
+
 @app.get("/api/files")
 async def list_files():
     """List CSV files in the data directory."""
     try:
         files = [
             {
-                "name": f.name,
-                "size": f.stat().st_size,
-                "modified": f.stat().st_mtime,
+                "name": name,
+                "size": st.st_size,
+                "modified": st.st_mtime,
             }
-            for f in DATA_DIR.glob("*.csv")
+            for name, st in _iter_csvs(DATA_DIR)
         ]
         return {"files": files}
     except Exception as e:
@@ -613,21 +806,19 @@ async def list_files():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Query parameter domains, validated by FastAPI before the handlers run
+# (invalid values get a 422 listing the allowed ones).
+IntradayInterval = Literal["1m", "2m", "5m", "15m", "30m", "60m", "90m"]
+MultidayInterval = Literal["15m", "30m", "60m"]
+
+
 @app.get("/api/intraday")
 async def get_intraday(
-    interval: str = Query("5m", description="Data interval (1m, 5m, 15m, 30m, 60m)"),
+    interval: IntradayInterval = Query("5m", description="Data interval (1m, 5m, 15m, 30m, 60m)"),
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format (defaults to today)"),
 ):
     """Get intraday portfolio performance for a given date (defaults to today)."""
-    if portfolio is None:
-        load_portfolio()
-
-    valid_intervals = ["1m", "2m", "5m", "15m", "30m", "60m", "90m"]
-    if interval not in valid_intervals:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid interval. Must be one of: {', '.join(valid_intervals)}"
-        )
+    p = _current_portfolio()
 
     today = market_today()
     target_date = today
@@ -639,61 +830,39 @@ async def get_intraday(
         if target_date > today:
             raise HTTPException(status_code=400, detail="Date cannot be in the future.")
 
+    # A past day's bars are final, so those responses are kept much longer.
     if target_date < today:
-        cache_key = f"intraday-hist_{target_date.isoformat()}_{interval}"
+        cache_key = ("intraday-hist", target_date, interval)
     else:
-        cache_key = f"intraday_{interval}"
+        cache_key = ("intraday", interval)
     cached = _get_api_cache(cache_key)
     if cached is not None:
         return cached
 
     try:
         if target_date == today:
-            intraday_data = portfolio.get_intraday_values(interval=interval)
+            intraday_data = p.get_intraday_values(interval=interval)
         else:
-            intraday_data = portfolio.get_intraday_values_for_date(target_date, interval=interval)
+            intraday_data = p.get_intraday_values_for_date(target_date, interval=interval)
         result = {"intraday": intraday_data, "date": target_date.isoformat()}
-        _set_api_cache(cache_key, result)
-        return result
+        return _set_api_cache(cache_key, result, _API_TTL_NS[cache_key[0]])
     except Exception as e:
         logger.error(f"Error fetching intraday data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/intraday-multiday")
-async def get_intraday_multiday(
-    interval: str = Query("15m", description="Data interval (15m, 30m, 60m)"),
-    days: int = Query(3, description="Number of days (1-7)"),
+@_ttl_cached("intraday-multiday")
+def get_intraday_multiday(
+    interval: MultidayInterval = Query("15m", description="Data interval (15m, 30m, 60m)"),
+    days: int = Query(3, ge=1, le=8, description="Number of days (1-8)"),
 ):
     """Get multi-day intraday portfolio performance."""
-    if portfolio is None:
-        load_portfolio()
-
-    # Validate interval
-    valid_intervals = ["15m", "30m", "60m"]
-    if interval not in valid_intervals:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid interval. Must be one of: {', '.join(valid_intervals)}"
-        )
-
-    # Validate days
-    if days < 1 or days > 8:
-        raise HTTPException(
-            status_code=400,
-            detail="Days must be between 1 and 8"
-        )
-
-    cache_key = f"intraday-multiday_{interval}_{days}"
-    cached = _get_api_cache(cache_key)
-    if cached is not None:
-        return cached
+    p = _current_portfolio()
 
     try:
-        data = portfolio.get_multiday_intraday_values(interval=interval, days=days)
-        result = {"data": data, "interval": interval, "days": days}
-        _set_api_cache(cache_key, result)
-        return result
+        data = p.get_multiday_intraday_values(interval=interval, days=days)
+        return {"data": data, "interval": interval, "days": days}
     except Exception as e:
         logger.error(f"Error fetching multi-day intraday data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -709,8 +878,7 @@ async def get_investments(
     This endpoint does NOT require yfinance data - it only uses transaction records.
     Much faster and more reliable for showing investment history.
     """
-    if portfolio is None:
-        load_portfolio()
+    p = _current_portfolio()
 
     try:
         from datetime import datetime
@@ -723,8 +891,8 @@ async def get_investments(
         if end_date:
             end = datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        history = portfolio.get_investment_history(start_date=start, end_date=end)
-        return {"investments": history}
+        history = p.get_investment_history(start_date=start, end_date=end)
+        return _stream_json("investments", history)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
     except Exception as e:
@@ -737,6 +905,7 @@ async def get_cache_stats():
     """Get cache statistics."""
     try:
         stats = cache_service.get_cache_stats()
+        stats["api_cache_entries"] = len(_api_cache)
         return stats
     except Exception as e:
         logger.error(f"Error getting cache stats: {e}")
@@ -1,11 +1,16 @@
 """Data models for the portfolio tracker."""
 
+from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Callable, Iterable, Mapping, Optional
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, TypeAdapter, model_validator
+
+# Shared Decimal constants, so hot paths don't re-parse string literals.
+_D_ZERO = Decimal(0)
+_D_HUNDRED = Decimal(100)
 
 
 class ActionType(str, Enum):
@@ -20,8 +25,20 @@ class ActionType(str, Enum):
     FIX = "FIX"    # Fix/reconcile quantity to known value
 
 
+# Actions that move share quantity, and so are split-adjusted and need
+# price history. A frozenset: one hash lookup per membership test instead
+# of building a tuple of enum members each time.
+POSITION_ACTIONS = frozenset({ActionType.BUY, ActionType.SELL, ActionType.GIFT, ActionType.GAS})
+
+
 class Transaction(BaseModel):
     """Represents a single portfolio transaction."""
+    # Every caller passes known keyword fields. Instances are immutable (and
+    # hashable) once validated; validate_fields is the only writer and fills
+    # in normalized/derived values with object.__setattr__ before anyone else
+    # sees the instance.
+    model_config = ConfigDict(extra="forbid", validate_assignment=False, frozen=True)
+
     date: date
     asset: str
     action: ActionType
@@ -31,64 +48,96 @@ class Transaction(BaseModel):
     source: Optional[str] = None
     comment: Optional[str] = None
 
-    @field_validator("asset")
-    @classmethod
-    def normalize_asset(cls, v: str) -> str:
-        """Normalize asset symbol to uppercase."""
-        return v.upper().strip()
-
     @model_validator(mode="after")
     def validate_fields(self) -> "Transaction":
-        """Validate that required fields are present based on action type."""
-        action = self.action
-        amount = self.amount
-        quantity = self.quantity
-        ave_price = self.ave_price
-
-        if action in (ActionType.BUY, ActionType.SELL):
-            # Need at least 2 of: amount, quantity, ave_price
-            provided = sum(1 for v in [amount, quantity, ave_price] if v is not None)
-            if provided < 2:
-                raise ValueError(
-                    f"{action.value} requires at least 2 of: amount, quantity, ave_price"
-                )
-            # Calculate missing value if only 2 provided
-            if provided == 2:
-                if amount is None and quantity and ave_price:
-                    self.amount = quantity * ave_price
-                elif quantity is None and amount and ave_price:
-                    self.quantity = amount / ave_price
-                elif ave_price is None and amount and quantity:
-                    self.ave_price = amount / quantity
-
-        elif action == ActionType.DIV:
-            if amount is None:
-                raise ValueError("DIV action requires amount")
-
-        elif action == ActionType.GIFT:
-            if quantity is None:
-                raise ValueError("GIFT action requires quantity")
-
-        elif action == ActionType.FEE:
-            if amount is None:
-                raise ValueError("FEE action requires amount")
-
-        elif action == ActionType.GAS:
-            if quantity is None:
-                raise ValueError("GAS action requires quantity")
-
-        elif action == ActionType.CASH:
-            if amount is None:
-                raise ValueError("CASH action requires amount (cash balance)")
-
-        elif action == ActionType.FIX:
-            if quantity is None:
-                raise ValueError("FIX action requires quantity (the correct total quantity)")
-
+        """Normalize the asset symbol and validate fields for the action type.
+
+        The symbol is uppercased here rather than in a separate field
+        validator, so each transaction makes one Python validator call.
+        """
+        object.__setattr__(self, "asset", self.asset.upper().strip())
+        validator = _ACTION_VALIDATORS.get(self.action)
+        if validator is not None:
+            validator(self)
         return self
 
 
-class Holding(BaseModel):
+def _complete_trade(
+    amount: Optional[Decimal],
+    quantity: Optional[Decimal],
+    ave_price: Optional[Decimal],
+) -> tuple[Optional[Decimal], Optional[Decimal], Optional[Decimal]]:
+    """Derive the missing one of amount = quantity * ave_price.
+
+    Pure function of its inputs: the triple comes back unchanged unless
+    exactly one value is None and the other two are non-zero.
+    """
+    if amount is None:
+        if quantity and ave_price:
+            amount = quantity * ave_price
+    elif quantity is None:
+        if amount and ave_price:
+            quantity = amount / ave_price
+    elif ave_price is None:
+        if amount and quantity:
+            ave_price = amount / quantity
+    return amount, quantity, ave_price
+
+
+def _validate_trade(tx: Transaction) -> None:
+    """BUY/SELL: need at least 2 of amount, quantity, ave_price; infer the third."""
+    amount = tx.amount
+    quantity = tx.quantity
+    ave_price = tx.ave_price
+
+    # Count by adding bools: no generator or list per row.
+    missing = (amount is None) + (quantity is None) + (ave_price is None)
+    if missing > 1:
+        raise ValueError(
+            f"{tx.action.value} requires at least 2 of: amount, quantity, ave_price"
+        )
+    # Calculate missing value if only 2 provided
+    if missing == 1:
+        amount, quantity, ave_price = _complete_trade(amount, quantity, ave_price)
+        object.__setattr__(tx, "amount", amount)
+        object.__setattr__(tx, "quantity", quantity)
+        object.__setattr__(tx, "ave_price", ave_price)
+
+
+def _require(field: str, message: str) -> Callable[[Transaction], None]:
+    """Build a validator that rejects transactions missing ``field``."""
+    def validate(tx: Transaction) -> None:
+        if getattr(tx, field) is None:
+            raise ValueError(message)
+    return validate
+
+
+# Per-action field checks, looked up once per transaction instead of walking
+# an if/elif chain over ActionType.
+_ACTION_VALIDATORS: dict[ActionType, Callable[[Transaction], None]] = {
+    ActionType.BUY: _validate_trade,
+    ActionType.SELL: _validate_trade,
+    ActionType.DIV: _require("amount", "DIV action requires amount"),
+    ActionType.GIFT: _require("quantity", "GIFT action requires quantity"),
+    ActionType.FEE: _require("amount", "FEE action requires amount"),
+    ActionType.GAS: _require("quantity", "GAS action requires quantity"),
+    ActionType.CASH: _require("amount", "CASH action requires amount (cash balance)"),
+    ActionType.FIX: _require("quantity", "FIX action requires quantity (the correct total quantity)"),
+}
+
+
+# Compiled once and reused by the bulk loaders (CSV rows, DB rows): validating
+# a field dict through the adapter skips the per-call BaseModel.__init__ hop.
+transaction_adapter = TypeAdapter(Transaction)
+
+
+# The result types below are built internally from already-validated data, so
+# they are plain slotted dataclasses rather than pydantic models: no
+# per-field validation on construction and no per-instance __dict__.
+
+
+@dataclass(slots=True, kw_only=True)
+class Holding:
     """Represents a current position in an asset."""
     symbol: str
     quantity: Decimal
@@ -131,26 +180,44 @@ class Holding(BaseModel):
         self.market_value = self.quantity * price
         self.unrealized_pnl = self.market_value - self.cost_basis
         if self.cost_basis > 0:
-            self.pnl_percent = (self.unrealized_pnl / self.cost_basis) * 100
+            self.pnl_percent = (self.unrealized_pnl / self.cost_basis) * _D_HUNDRED
         else:
             # For gifts with zero cost basis
-            self.pnl_percent = Decimal("100") if self.market_value > 0 else Decimal("0")
+            self.pnl_percent = _D_HUNDRED if self.market_value > 0 else _D_ZERO
 
         # Daily price change
         if prev_close is not None and prev_close > 0:
             self.prev_close = prev_close
-            self.daily_change_percent = ((price - prev_close) / prev_close) * 100
+            self.daily_change_percent = ((price - prev_close) / prev_close) * _D_HUNDRED
             self.daily_change_amount = (price - prev_close) * self.quantity
 
-
-class DividendSummary(BaseModel):
+    @classmethod
+    def bulk_update_with_prices(
+        cls,
+        holdings: Iterable["Holding"],
+        prices: Mapping[str, Decimal],
+        prev_closes: Mapping[str, Decimal],
+    ) -> None:
+        """Update every holding that has a quote in ``prices`` in one pass."""
+        update = cls.update_with_price
+        get_price = prices.get
+        get_prev_close = prev_closes.get
+        for holding in holdings:
+            price = get_price(holding.symbol)
+            if price is not None:
+                update(holding, price, get_prev_close(holding.symbol))
+
+
+@dataclass(slots=True, kw_only=True)
+class DividendSummary:
     """Summary of dividends for an asset."""
     symbol: str
     total_amount: Decimal
     payment_count: int
 
 
-class PortfolioSummary(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class PortfolioSummary:
     """Overall portfolio summary."""
     total_cost_basis: Decimal
     total_market_value: Decimal  # includes cash
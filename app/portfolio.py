@@ -2,15 +2,19 @@
 
 import bisect
 import logging
-from collections import defaultdict
+import math
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 from zoneinfo import ZoneInfo
 
 from .models import (
     ActionType,
     DividendSummary,
+    POSITION_ACTIONS,
     Holding,
     PortfolioSummary,
     Transaction,
@@ -22,6 +26,12 @@ from .split_service import split_service
 logger = logging.getLogger(__name__)
 MARKET_TZ = ZoneInfo("America/New_York")
 
+# Decimal constants shared by the hot loops, built once instead of parsed
+# from a string literal on every use.
+_D_ZERO = Decimal(0)
+_D_ONE = Decimal(1)
+_D_DAYS_PER_YEAR = Decimal(365)
+
 
 def _market_today() -> date:
     """Return today's date in the US market timezone."""
@@ -36,6 +46,8 @@ def _market_now() -> datetime:
 class LotInfo:
     """Represents a lot of shares purchased at a specific price."""
 
+    __slots__ = ("quantity", "cost_per_share", "purchase_date")
+
     def __init__(self, quantity: Decimal, cost_per_share: Decimal, purchase_date: date):
         self.quantity = quantity
         self.cost_per_share = cost_per_share
@@ -46,6 +58,35 @@ class LotInfo:
         return self.quantity * self.cost_per_share
 
 
+def _lot_totals(lots: Iterable[LotInfo]) -> tuple[Decimal, Decimal]:
+    """Total quantity and cost basis of ``lots``, in one pass."""
+    quantity = _D_ZERO
+    cost = _D_ZERO
+    for lot in lots:
+        quantity += lot.quantity
+        cost += lot.quantity * lot.cost_per_share
+    return quantity, cost
+
+
+# Category classification for get_investment_history (matching frontend logic)
+_SYMBOL_TO_CATEGORY = {
+    'BTC-USD': 'Crypto', 'ETH-USD': 'Crypto', 'MSTR': 'Crypto', 'CRCL': 'Crypto', 'IBIT': 'Crypto',
+    'VOO': 'Index', 'QQQM': 'Index', 'QQQ': 'Index', 'BRK-B': 'Index',
+    'CASH': 'Cash',
+}
+
+
+@lru_cache(maxsize=256)
+def _get_category(symbol: str) -> str:
+    """Return the investment-history category of ``symbol``."""
+    category = _SYMBOL_TO_CATEGORY.get(symbol)
+    if category is not None:
+        return category
+    if symbol.endswith('-USD'):
+        return 'Crypto'
+    return 'Individual Stocks'
+
+
 class Portfolio:
     """Manages portfolio positions and calculations."""
 
@@ -55,20 +96,36 @@ class Portfolio:
         Args:
             adjust_splits: Whether to automatically adjust for stock splits
         """
-        # Symbol -> list of lots (FIFO order)
-        self._lots: dict[str, list[LotInfo]] = defaultdict(list)
+        # Symbol -> deque of lots (FIFO order; sells consume from the left)
+        self._lots: dict[str, deque[LotInfo]] = defaultdict(deque)
         # Symbol -> list of dividend amounts
         self._dividends: dict[str, list[Decimal]] = defaultdict(list)
+        # Running dividend totals, per symbol and overall
+        self._dividend_totals: dict[str, Decimal] = defaultdict(Decimal)
+        self._total_dividends: Decimal = _D_ZERO
         # Total fees paid
-        self._total_fees: Decimal = Decimal("0")
+        self._total_fees: Decimal = _D_ZERO
         # All transactions sorted by date
         self._transactions: list[Transaction] = []
         # Split adjustment flag
         self._adjust_splits = adjust_splits
         # Cash snapshots: date -> amount
         self._cash_snapshots: dict[date, Decimal] = {}
+        # Snapshot dates in ascending order, for bisect lookups
+        self._cash_snapshot_dates: list[date] = []
         # Realized sales: symbol -> list of {quantity, cost_basis, proceeds}
         self._sales: dict[str, list[dict]] = defaultdict(list)
+        # Symbol -> running totals over its sales (see _add_sale_totals)
+        self._sale_totals: dict[str, dict[str, Decimal]] = {}
+        # Symbol -> its transactions, in the order they were added
+        self._txns_by_symbol: dict[str, list[Transaction]] = defaultdict(list)
+        # (symbol, transaction date) -> split adjustment factor to today. Shared
+        # with the replay portfolios built by _replay_portfolio().
+        self._factor_cache: dict[tuple[str, date], Decimal] = {}
+        # (symbol, as-of date) -> holding days; cleared when transactions are added
+        self._holding_days_cache: dict[tuple[str, date], int] = {}
+        # _transactions sorted by date, built on first use by _sorted_transactions()
+        self._sorted_txns: Optional[list[Transaction]] = None
 
     def add_transactions(self, transactions: list[Transaction]) -> None:
         """Add transactions to the portfolio.
@@ -79,161 +136,295 @@ class Portfolio:
         # Sort by date
         sorted_txns = sorted(transactions, key=lambda t: t.date)
 
+        if self._adjust_splits:
+            self._prefetch_split_factors(sorted_txns)
+
         for txn in sorted_txns:
             self._process_transaction(txn)
             self._transactions.append(txn)
+            self._txns_by_symbol[txn.asset].append(txn)
+        self._holding_days_cache.clear()
+        self._sorted_txns = None
+
+    def _sorted_transactions(self) -> list[Transaction]:
+        """All transactions sorted by date (stable), cached until the next add.
+
+        The returned list is shared; callers must not modify it.
+        """
+        if self._sorted_txns is None:
+            self._sorted_txns = sorted(self._transactions, key=lambda t: t.date)
+        return self._sorted_txns
+
+    def _prefetch_split_factors(self, transactions: list[Transaction]) -> None:
+        """Fill the split factor cache with one split_service call per symbol."""
+        today = _market_today()
+        dates_by_symbol: dict[str, set[date]] = defaultdict(set)
+        for txn in transactions:
+            if txn.action in POSITION_ACTIONS and (txn.asset, txn.date) not in self._factor_cache:
+                dates_by_symbol[txn.asset].add(txn.date)
+
+        for symbol, dates in dates_by_symbol.items():
+            factors = split_service.get_adjustment_factors(symbol, dates, today)
+            for txn_date, factor in factors.items():
+                self._factor_cache[(symbol, txn_date)] = factor
+
+    def _replay_portfolio(self) -> "Portfolio":
+        """Empty Portfolio for replaying this one's transactions.
+
+        It shares the split factor cache, so replays don't query
+        split_service again.
+        """
+        replay = Portfolio(adjust_splits=self._adjust_splits)
+        replay._factor_cache = self._factor_cache
+        return replay
+
+    def _replay_daily(
+        self, start: date, end: date
+    ) -> Iterator[tuple[date, "Portfolio", set[str], int]]:
+        """Replay transactions into a fresh portfolio, one calendar day at a time.
+
+        Transactions before ``start`` are applied up front; then, for each day
+        from ``start`` to ``end`` inclusive, that day's transactions are
+        applied and ``(day, replay portfolio, touched symbols, transactions
+        replayed so far)`` is yielded. ``touched`` holds the symbols whose
+        transactions were applied since the previous yield and is cleared when
+        iteration resumes, so consume it before advancing.
+        """
+        replay = self._replay_portfolio()
+        sorted_txns = self._sorted_transactions()
+        touched: set[str] = set()
+
+        # Fast-forward to transactions before start
+        txn_idx = 0
+        for txn in sorted_txns:
+            if txn.date >= start:
+                break
+            replay._process_transaction(txn)
+            touched.add(txn.asset)
+            txn_idx += 1
+
+        current_date = start
+        while current_date <= end:
+            while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date <= current_date:
+                replay._process_transaction(sorted_txns[txn_idx])
+                touched.add(sorted_txns[txn_idx].asset)
+                txn_idx += 1
+
+            yield current_date, replay, touched, txn_idx
+            touched.clear()
+            current_date += timedelta(days=1)
 
     def _process_transaction(self, txn: Transaction) -> None:
         """Process a single transaction.
 
         All quantities are adjusted to today's split-adjusted values.
         """
-        symbol = txn.asset
-        today = _market_today()
-
         # Get split adjustment factor from transaction date to today
-        if self._adjust_splits and txn.action in (
-            ActionType.BUY, ActionType.SELL, ActionType.GIFT, ActionType.GAS
-        ):
-            factor = split_service.get_adjustment_factor(symbol, txn.date, today)
+        if self._adjust_splits and txn.action in POSITION_ACTIONS:
+            key = (txn.asset, txn.date)
+            factor = self._factor_cache.get(key)
+            if factor is None:
+                factor = split_service.get_adjustment_factor(txn.asset, txn.date, _market_today())
+                self._factor_cache[key] = factor
         else:
-            factor = Decimal("1")
+            factor = _D_ONE
+
+        # Handlers compare factor to _D_ONE and keep the transaction's own
+        # values when no split applies (the usual case).
+        self._ACTION_HANDLERS[txn.action](self, txn, factor)
 
-        if txn.action == ActionType.BUY:
-            # Adjust quantity and price for splits
+    def _apply_buy(self, txn: Transaction, factor: Decimal) -> None:
+        """Open a new lot at the split-adjusted price."""
+        symbol = txn.asset
+        # Adjust quantity and price for splits
+        if factor == _D_ONE:
+            adjusted_qty = txn.quantity
+            adjusted_price = txn.ave_price
+        else:
             adjusted_qty = txn.quantity * factor
             adjusted_price = txn.ave_price / factor if factor != 0 else txn.ave_price
 
-            lot = LotInfo(
-                quantity=adjusted_qty,
-                cost_per_share=adjusted_price,
-                purchase_date=txn.date,
-            )
-            self._lots[symbol].append(lot)
+        lot = LotInfo(
+            quantity=adjusted_qty,
+            cost_per_share=adjusted_price,
+            purchase_date=txn.date,
+        )
+        self._lots[symbol].append(lot)
 
-        elif txn.action == ActionType.SELL:
-            # Adjust sell quantity and price for splits
+    def _apply_sell(self, txn: Transaction, factor: Decimal) -> None:
+        """Close lots FIFO and record the sale, split into long/short term."""
+        symbol = txn.asset
+        # Adjust sell quantity and price for splits
+        if factor == _D_ONE:
+            adjusted_qty = txn.quantity
+            adjusted_price = txn.ave_price
+        else:
             adjusted_qty = txn.quantity * factor
             adjusted_price = txn.ave_price / factor if factor != 0 else txn.ave_price
-            proceeds = adjusted_qty * adjusted_price
-
-            # Remove shares using FIFO and track cost basis (split LT vs ST)
-            remaining = adjusted_qty
-            total_cost_basis = Decimal("0")
-            qty_sold = Decimal("0")
-            lt_cost_basis = Decimal("0")
-            st_cost_basis = Decimal("0")
-            lt_proceeds = Decimal("0")
-            st_proceeds = Decimal("0")
-            sale_price = adjusted_price  # per share
+        proceeds = adjusted_qty * adjusted_price
+
+        # Remove shares using FIFO and track cost basis (split LT vs ST)
+        remaining = adjusted_qty
+        total_cost_basis = _D_ZERO
+        qty_sold = _D_ZERO
+        lt_cost_basis = _D_ZERO
+        st_cost_basis = _D_ZERO
+        lt_proceeds = _D_ZERO
+        st_proceeds = _D_ZERO
+        sale_price = adjusted_price  # per share
+
+        while remaining > 0 and self._lots[symbol]:
+            lot = self._lots[symbol][0]
+            # LT if held >= 365 days at sale date
+            is_lt = (txn.date - lot.purchase_date).days >= 365
+            if lot.quantity <= remaining:
+                # Sell entire lot
+                slice_qty = lot.quantity
+                slice_cost = lot.total_cost
+                total_cost_basis += slice_cost
+                qty_sold += slice_qty
+                remaining -= slice_qty
+                self._lots[symbol].popleft()
+            else:
+                # Partial lot sale
+                slice_qty = remaining
+                slice_cost = remaining * lot.cost_per_share
+                total_cost_basis += slice_cost
+                qty_sold += slice_qty
+                lot.quantity -= remaining
+                remaining = _D_ZERO
+
+            slice_proceeds = slice_qty * sale_price
+            if is_lt:
+                lt_cost_basis += slice_cost
+                lt_proceeds += slice_proceeds
+            else:
+                st_cost_basis += slice_cost
+                st_proceeds += slice_proceeds
+
+        # Record the sale
+        if qty_sold > 0:
+            sale = {
+                "date": txn.date,
+                "quantity": qty_sold,
+                "cost_basis": total_cost_basis,
+                "proceeds": proceeds,
+                "lt_cost_basis": lt_cost_basis,
+                "st_cost_basis": st_cost_basis,
+                "lt_proceeds": lt_proceeds,
+                "st_proceeds": st_proceeds,
+            }
+            self._sales[symbol].append(sale)
+            self._add_sale_totals(symbol, sale)
+
+    def _add_sale_totals(self, symbol: str, sale: dict) -> None:
+        """Fold one sale record into the symbol's running sale totals."""
+        totals = self._sale_totals.get(symbol)
+        if totals is None:
+            totals = self._sale_totals[symbol] = {
+                "quantity": _D_ZERO,
+                "cost_basis": _D_ZERO,
+                "proceeds": _D_ZERO,
+                "realized_pnl": _D_ZERO,
+                "lt_realized_pnl": _D_ZERO,
+                "st_realized_pnl": _D_ZERO,
+            }
+        totals["quantity"] += sale["quantity"]
+        totals["cost_basis"] += sale["cost_basis"]
+        totals["proceeds"] += sale["proceeds"]
+        totals["realized_pnl"] += sale["proceeds"] - sale["cost_basis"]
+        totals["lt_realized_pnl"] += sale["lt_proceeds"] - sale["lt_cost_basis"]
+        totals["st_realized_pnl"] += sale["st_proceeds"] - sale["st_cost_basis"]
+
+    def _apply_div(self, txn: Transaction, factor: Decimal) -> None:
+        """Record a dividend payment."""
+        symbol = txn.asset
+        self._dividends[symbol].append(txn.amount)
+        self._dividend_totals[symbol] += txn.amount
+        self._total_dividends += txn.amount
 
-            while remaining > 0 and self._lots[symbol]:
-                lot = self._lots[symbol][0]
-                # LT if held >= 365 days at sale date
-                is_lt = (txn.date - lot.purchase_date).days >= 365
-                if lot.quantity <= remaining:
-                    # Sell entire lot
-                    slice_qty = lot.quantity
-                    slice_cost = lot.total_cost
-                    total_cost_basis += slice_cost
-                    qty_sold += slice_qty
-                    remaining -= slice_qty
-                    self._lots[symbol].pop(0)
-                else:
-                    # Partial lot sale
-                    slice_qty = remaining
-                    slice_cost = remaining * lot.cost_per_share
-                    total_cost_basis += slice_cost
-                    qty_sold += slice_qty
-                    lot.quantity -= remaining
-                    remaining = Decimal("0")
+    def _apply_gift(self, txn: Transaction, factor: Decimal) -> None:
+        """Open a zero-cost lot."""
+        symbol = txn.asset
+        # Adjust quantity for splits, cost basis is zero
+        adjusted_qty = txn.quantity * factor if factor != _D_ONE else txn.quantity
 
-                slice_proceeds = slice_qty * sale_price
-                if is_lt:
-                    lt_cost_basis += slice_cost
-                    lt_proceeds += slice_proceeds
-                else:
-                    st_cost_basis += slice_cost
-                    st_proceeds += slice_proceeds
-
-            # Record the sale
-            if qty_sold > 0:
-                self._sales[symbol].append({
-                    "date": txn.date,
-                    "quantity": qty_sold,
-                    "cost_basis": total_cost_basis,
-                    "proceeds": proceeds,
-                    "lt_cost_basis": lt_cost_basis,
-                    "st_cost_basis": st_cost_basis,
-                    "lt_proceeds": lt_proceeds,
-                    "st_proceeds": st_proceeds,
-                })
+        lot = LotInfo(
+            quantity=adjusted_qty,
+            cost_per_share=_D_ZERO,
+            purchase_date=txn.date,
+        )
+        self._lots[symbol].append(lot)
 
-        elif txn.action == ActionType.DIV:
-            self._dividends[symbol].append(txn.amount)
+    def _apply_fee(self, txn: Transaction, factor: Decimal) -> None:
+        """Add to total fees paid."""
+        self._total_fees += txn.amount
 
-        elif txn.action == ActionType.GIFT:
-            # Adjust quantity for splits, cost basis is zero
-            adjusted_qty = txn.quantity * factor
+    def _apply_gas(self, txn: Transaction, factor: Decimal) -> None:
+        """Deduct a fee paid in units of the asset from the position, FIFO."""
+        symbol = txn.asset
+        # Adjust gas quantity for splits
+        adjusted_qty = txn.quantity * factor if factor != _D_ONE else txn.quantity
+
+        # Deduct from position using FIFO
+        remaining = adjusted_qty
+        while remaining > 0 and self._lots[symbol]:
+            lot = self._lots[symbol][0]
+            if lot.quantity <= remaining:
+                remaining -= lot.quantity
+                self._lots[symbol].popleft()
+            else:
+                lot.quantity -= remaining
+                remaining = _D_ZERO
 
+    def _apply_cash(self, txn: Transaction, factor: Decimal) -> None:
+        """Record a cash balance snapshot."""
+        if txn.date not in self._cash_snapshots:
+            bisect.insort(self._cash_snapshot_dates, txn.date)
+        self._cash_snapshots[txn.date] = txn.amount
+
+    def _apply_fix(self, txn: Transaction, factor: Decimal) -> None:
+        """Reconcile the position to a known total quantity."""
+        symbol = txn.asset
+        # Adjust FIX quantity for splits
+        target_qty = txn.quantity * factor if factor != _D_ONE else txn.quantity
+
+        # Calculate current quantity for this symbol
+        current_qty, _ = _lot_totals(self._lots[symbol])
+
+        if target_qty > current_qty:
+            # Missing shares - add them as zero-cost lot
+            missing_qty = target_qty - current_qty
             lot = LotInfo(
-                quantity=adjusted_qty,
-                cost_per_share=Decimal("0"),
+                quantity=missing_qty,
+                cost_per_share=_D_ZERO,
                 purchase_date=txn.date,
             )
             self._lots[symbol].append(lot)
-
-        elif txn.action == ActionType.FEE:
-            self._total_fees += txn.amount
-
-        elif txn.action == ActionType.GAS:
-            # Adjust gas quantity for splits
-            adjusted_qty = txn.quantity * factor
-
-            # Deduct from position using FIFO
-            remaining = adjusted_qty
+        elif target_qty < current_qty:
+            # Too many shares - remove excess using FIFO
+            excess_qty = current_qty - target_qty
+            remaining = excess_qty
             while remaining > 0 and self._lots[symbol]:
                 lot = self._lots[symbol][0]
                 if lot.quantity <= remaining:
                     remaining -= lot.quantity
-                    self._lots[symbol].pop(0)
+                    self._lots[symbol].popleft()
                 else:
                     lot.quantity -= remaining
-                    remaining = Decimal("0")
-
-        elif txn.action == ActionType.CASH:
-            # Cash balance snapshot
-            self._cash_snapshots[txn.date] = txn.amount
-
-        elif txn.action == ActionType.FIX:
-            # Reconcile position to a known quantity
-            # Adjust FIX quantity for splits
-            target_qty = txn.quantity * factor
-
-            # Calculate current quantity for this symbol
-            current_qty = sum(lot.quantity for lot in self._lots[symbol])
-
-            if target_qty > current_qty:
-                # Missing shares - add them as zero-cost lot
-                missing_qty = target_qty - current_qty
-                lot = LotInfo(
-                    quantity=missing_qty,
-                    cost_per_share=Decimal("0"),
-                    purchase_date=txn.date,
-                )
-                self._lots[symbol].append(lot)
-            elif target_qty < current_qty:
-                # Too many shares - remove excess using FIFO
-                excess_qty = current_qty - target_qty
-                remaining = excess_qty
-                while remaining > 0 and self._lots[symbol]:
-                    lot = self._lots[symbol][0]
-                    if lot.quantity <= remaining:
-                        remaining -= lot.quantity
-                        self._lots[symbol].pop(0)
-                    else:
-                        lot.quantity -= remaining
-                        remaining = Decimal("0")
+                    remaining = _D_ZERO
+
+    # Per-action transaction handlers, looked up once per transaction.
+    _ACTION_HANDLERS = {
+        ActionType.BUY: _apply_buy,
+        ActionType.SELL: _apply_sell,
+        ActionType.DIV: _apply_div,
+        ActionType.GIFT: _apply_gift,
+        ActionType.FEE: _apply_fee,
+        ActionType.GAS: _apply_gas,
+        ActionType.CASH: _apply_cash,
+        ActionType.FIX: _apply_fix,
+    }
 
     def get_holdings(self, fetch_prices: bool = True) -> list[Holding]:
         """Get current holdings.
@@ -244,6 +435,18 @@ class Portfolio:
         Returns:
             List of Holding objects
         """
+        holdings, _, _ = self._get_holdings(fetch_prices)
+        return holdings
+
+    def _get_holdings(
+        self, fetch_prices: bool
+    ) -> tuple[list[Holding], Optional[Decimal], dict[str, Decimal]]:
+        """get_holdings, plus the weighted CAGR and price lookup of the same lots.
+
+        The per-holding and portfolio-wide weighted CAGRs come from one pass
+        over the lots, and the symbol -> current price map built for it is
+        returned too, so get_portfolio_summary doesn't repeat either.
+        """
         holdings = []
         symbols = []
 
@@ -252,13 +455,12 @@ class Portfolio:
                 continue
 
             # Quantities are already split-adjusted at transaction time
-            total_quantity = sum(lot.quantity for lot in lots)
-            total_cost = sum(lot.total_cost for lot in lots)
+            total_quantity, total_cost = _lot_totals(lots)
 
             if total_quantity <= 0:
                 continue
 
-            avg_cost = total_cost / total_quantity if total_quantity > 0 else Decimal("0")
+            avg_cost = total_cost / total_quantity if total_quantity > 0 else _D_ZERO
 
             holding = Holding(
                 symbol=symbol,
@@ -277,32 +479,29 @@ class Portfolio:
             year_start_prices = price_service.get_year_start_prices_batch(
                 symbols, _market_today().year
             )
-            for holding in holdings:
-                price = prices.get(holding.symbol)
-                prev_close = prev_closes.get(holding.symbol)
-                if price is not None:
-                    holding.update_with_price(price, prev_close)
+            Holding.bulk_update_with_prices(holdings, prices, prev_closes)
 
         # Calculate holding days and annualized return for each holding
-        import math
         today = _market_today()
+        price_lookup = {h.symbol: h.current_price for h in holdings if h.current_price}
+        weighted_cagr_by_symbol, weighted_cagr = self._weighted_cagr(price_lookup, today)
         for holding in holdings:
             holding_days = self.get_holding_days(holding.symbol)
             holding.holding_days = holding_days
 
             if holding_days > 0 and holding.pnl_percent is not None:
-                years = Decimal(str(holding_days)) / Decimal("365")
+                years = Decimal(holding_days) / _D_DAYS_PER_YEAR
                 # Use minimum 1 year for annualized calculation
-                years_for_calc = max(years, Decimal("1"))
+                years_for_calc = max(years, _D_ONE)
                 holding.annualized_return = holding.pnl_percent / years_for_calc
 
             # Calculate long-term vs short-term quantity (1 year threshold)
             # and split current unrealized P&L into LT/ST per-lot.
             if holding.symbol in self._lots:
-                lt_qty = Decimal("0")
-                st_qty = Decimal("0")
-                lt_unreal = Decimal("0")
-                st_unreal = Decimal("0")
+                lt_qty = _D_ZERO
+                st_qty = _D_ZERO
+                lt_unreal = _D_ZERO
+                st_unreal = _D_ZERO
                 one_year_ago = today - timedelta(days=365)
                 for lot in self._lots[holding.symbol]:
                     if lot.quantity <= 0:
@@ -331,10 +530,10 @@ class Portfolio:
             if holding.current_price is not None and holding.symbol in self._lots:
                 year_start = date(today.year, 1, 1)
                 year_start_price = year_start_prices.get(holding.symbol)
-                ytd_pnl = Decimal("0")
-                ytd_basis = Decimal("0")
-                lt_ytd = Decimal("0")
-                st_ytd = Decimal("0")
+                ytd_pnl = _D_ZERO
+                ytd_basis = _D_ZERO
+                lt_ytd = _D_ZERO
+                st_ytd = _D_ZERO
                 for lot in self._lots[holding.symbol]:
                     if lot.quantity <= 0:
                         continue
@@ -356,80 +555,98 @@ class Portfolio:
                     holding.ytd_pnl_percent = (ytd_pnl / ytd_basis) * 100
 
             # Realized P&L (prior sales of this symbol) — FIFO records
-            sales = self._sales.get(holding.symbol, [])
-            if sales:
-                realized = Decimal("0")
-                lt_real = Decimal("0")
-                st_real = Decimal("0")
-                sold_cost_sym = Decimal("0")
-                for s in sales:
-                    realized += s["proceeds"] - s["cost_basis"]
-                    sold_cost_sym += s["cost_basis"]
-                    # Older sale records may not have LT/ST split — fall back to 0/realized as ST
-                    lt_p = s.get("lt_proceeds", Decimal("0"))
-                    lt_c = s.get("lt_cost_basis", Decimal("0"))
-                    st_p = s.get("st_proceeds", Decimal("0"))
-                    st_c = s.get("st_cost_basis", Decimal("0"))
-                    lt_real += (lt_p - lt_c)
-                    st_real += (st_p - st_c)
-                holding.realized_pnl = realized
-                holding.lt_realized_pnl = lt_real
-                holding.st_realized_pnl = st_real
+            sale_totals = self._sale_totals.get(holding.symbol)
+            if sale_totals is not None:
+                holding.realized_pnl = sale_totals["realized_pnl"]
+                holding.lt_realized_pnl = sale_totals["lt_realized_pnl"]
+                holding.st_realized_pnl = sale_totals["st_realized_pnl"]
 
             # Total P&L (realized + unrealized) and % vs all-time invested in this symbol
-            unreal = holding.unrealized_pnl if holding.unrealized_pnl is not None else Decimal("0")
-            real = holding.realized_pnl if holding.realized_pnl is not None else Decimal("0")
+            unreal = holding.unrealized_pnl if holding.unrealized_pnl is not None else _D_ZERO
+            real = holding.realized_pnl if holding.realized_pnl is not None else _D_ZERO
             total = unreal + real
             holding.total_pnl = total
-            sold_cost = sum(
-                (s["cost_basis"] for s in self._sales.get(holding.symbol, [])),
-                start=Decimal("0"),
-            )
-            all_time_cost = (holding.cost_basis or Decimal("0")) + sold_cost
+            sold_cost = sale_totals["cost_basis"] if sale_totals is not None else _D_ZERO
+            all_time_cost = (holding.cost_basis or _D_ZERO) + sold_cost
             if all_time_cost > 0:
                 holding.total_pnl_percent = (total / all_time_cost) * 100
 
-            # Calculate per-lot cost-basis weighted CAGR
-            if holding.current_price and holding.symbol in self._lots:
-                lots = self._lots[holding.symbol]
-                weighted_sum = Decimal("0")
-                total_cost_basis_weight = Decimal("0")
-
-                for lot in lots:
-                    if lot.quantity <= 0 or lot.total_cost <= 0:
-                        continue
-
-                    lot_holding_days = (today - lot.purchase_date).days
-                    lot_years = Decimal(str(max(lot_holding_days, 1))) / Decimal("365")
-                    lot_years_for_calc = max(lot_years, Decimal("1"))
-
-                    lot_current_value = lot.quantity * holding.current_price
-                    growth_factor = lot_current_value / lot.total_cost
-
-                    if growth_factor > 0:
-                        cagr = (Decimal(str(math.pow(float(growth_factor), float(1 / lot_years_for_calc)))) - 1) * 100
-                        weighted_sum += lot.total_cost * cagr
-                        total_cost_basis_weight += lot.total_cost
-
-                if total_cost_basis_weight > 0:
-                    holding.weighted_annualized_return = weighted_sum / total_cost_basis_weight
+            # Per-lot cost-basis weighted CAGR
+            holding.weighted_annualized_return = weighted_cagr_by_symbol.get(holding.symbol)
 
         # Add cash as a holding if we have cash snapshots
         cash_balance = self.get_cash_balance()
         if cash_balance > 0:
             cash_holding = Holding(
                 symbol="CASH",
-                quantity=Decimal("1"),
+                quantity=_D_ONE,
                 cost_basis=cash_balance,
                 avg_cost=cash_balance,
                 current_price=cash_balance,
                 market_value=cash_balance,
-                unrealized_pnl=Decimal("0"),
-                pnl_percent=Decimal("0"),
+                unrealized_pnl=_D_ZERO,
+                pnl_percent=_D_ZERO,
             )
             holdings.append(cash_holding)
 
-        return sorted(holdings, key=lambda h: h.symbol)
+        return sorted(holdings, key=lambda h: h.symbol), weighted_cagr, price_lookup
+
+    def _weighted_cagr(
+        self, price_lookup: dict[str, Decimal], today: date
+    ) -> tuple[dict[str, Decimal], Optional[Decimal]]:
+        """Cost-basis weighted CAGR of the open lots, per symbol and overall.
+
+        Each lot's annualized return is weighted by its cost basis. Symbols
+        missing from ``price_lookup`` are skipped, and CASH is left out of the
+        overall figure.
+
+        Returns:
+            (symbol -> weighted CAGR, portfolio-wide weighted CAGR or None)
+        """
+        by_symbol: dict[str, Decimal] = {}
+        overall_sum = _D_ZERO
+        overall_weight = _D_ZERO
+
+        for symbol, lots in self._lots.items():
+            current_price = price_lookup.get(symbol)
+            if current_price is None:
+                continue
+            in_overall = symbol != "CASH"
+
+            weighted_sum = _D_ZERO
+            total_cost_basis_weight = _D_ZERO
+            for lot in lots:
+                if lot.quantity <= 0 or lot.total_cost <= 0:
+                    continue
+
+                # Holding period, minimum 1 year to avoid extrapolation
+                lot_holding_days = (today - lot.purchase_date).days
+                lot_years = Decimal(max(lot_holding_days, 1)) / _D_DAYS_PER_YEAR
+                lot_years_for_calc = max(lot_years, _D_ONE)
+
+                lot_current_value = lot.quantity * current_price
+                growth_factor = lot_current_value / lot.total_cost
+
+                # CAGR = growth_factor^(1/years) - 1, as percentage. Computed as
+                # expm1(log1p(g - 1) / years) with g - 1 taken exactly in
+                # Decimal: no cancellation around 1, where flat and short-held
+                # lots sit, and no separate pow + subtract.
+                if growth_factor > 0:
+                    growth = float(growth_factor - 1)
+                    cagr_f = math.expm1(math.log1p(growth) / float(lot_years_for_calc))
+                    cagr = Decimal(str(cagr_f * 100))
+                    weighted = lot.total_cost * cagr
+                    weighted_sum += weighted
+                    total_cost_basis_weight += lot.total_cost
+                    if in_overall:
+                        overall_sum += weighted
+                        overall_weight += lot.total_cost
+
+            if total_cost_basis_weight > 0:
+                by_symbol[symbol] = weighted_sum / total_cost_basis_weight
+
+        overall = overall_sum / overall_weight if overall_weight > 0 else None
+        return by_symbol, overall
 
     def get_cash_balance(self, as_of_date: Optional[date] = None) -> Decimal:
         """Get cash balance as of a specific date.
@@ -443,18 +660,18 @@ class Portfolio:
             Cash balance as Decimal
         """
         if not self._cash_snapshots:
-            return Decimal("0")
+            return _D_ZERO
 
         if as_of_date is None:
             as_of_date = _market_today()
 
         # Find the most recent snapshot on or before as_of_date
-        applicable_dates = [d for d in self._cash_snapshots.keys() if d <= as_of_date]
-        if not applicable_dates:
-            return Decimal("0")
+        dates = self._cash_snapshot_dates
+        idx = bisect.bisect_right(dates, as_of_date) - 1
+        if idx < 0:
+            return _D_ZERO
 
-        latest_date = max(applicable_dates)
-        return self._cash_snapshots[latest_date]
+        return self._cash_snapshots[dates[idx]]
 
     def get_holding_days(self, symbol: str) -> int:
         """Calculate the number of days a position has been held.
@@ -468,29 +685,36 @@ class Portfolio:
         Returns:
             Number of holding days
         """
-        # Get all transactions for this symbol sorted by date
-        symbol_txns = sorted(
-            [t for t in self._transactions if t.asset == symbol],
-            key=lambda t: t.date
-        )
+        today = _market_today()
+        key = (symbol, today)
+        days = self._holding_days_cache.get(key)
+        if days is None:
+            days = self._holding_days_cache[key] = self._compute_holding_days(symbol, today)
+        return days
+
+    def _compute_holding_days(self, symbol: str, today: date) -> int:
+        """Uncached get_holding_days, with open positions counted up to ``today``."""
+        # Transactions for this symbol sorted by date (already in order unless
+        # they were added in several batches)
+        symbol_txns = sorted(self._txns_by_symbol.get(symbol, ()), key=lambda t: t.date)
 
         if not symbol_txns:
             return 0
 
         # Track periods when position was open
         holding_periods = []  # List of (start_date, end_date) tuples
-        current_qty = Decimal("0")
+        current_qty = _D_ZERO
         period_start = None
 
         for txn in symbol_txns:
             prev_qty = current_qty
 
             if txn.action == ActionType.BUY or txn.action == ActionType.GIFT:
-                current_qty += txn.quantity or Decimal("0")
+                current_qty += txn.quantity or _D_ZERO
             elif txn.action == ActionType.SELL:
-                current_qty -= txn.quantity or Decimal("0")
+                current_qty -= txn.quantity or _D_ZERO
             elif txn.action == ActionType.GAS:
-                current_qty -= txn.quantity or Decimal("0")
+                current_qty -= txn.quantity or _D_ZERO
 
             # Position opened
             if prev_qty <= 0 and current_qty > 0:
@@ -503,7 +727,7 @@ class Portfolio:
 
         # If still holding, add current period
         if current_qty > 0 and period_start is not None:
-            holding_periods.append((period_start, _market_today()))
+            holding_periods.append((period_start, today))
 
         # Calculate total holding days
         total_days = 0
@@ -520,22 +744,19 @@ class Portfolio:
             List of DividendSummary objects
         """
         summaries = []
-        for symbol, amounts in self._dividends.items():
-            if amounts:
-                summaries.append(
-                    DividendSummary(
-                        symbol=symbol,
-                        total_amount=sum(amounts),
-                        payment_count=len(amounts),
-                    )
+        for symbol, total in self._dividend_totals.items():
+            summaries.append(
+                DividendSummary(
+                    symbol=symbol,
+                    total_amount=total,
+                    payment_count=len(self._dividends[symbol]),
                 )
+            )
         return sorted(summaries, key=lambda s: s.symbol)
 
     def get_total_dividends(self) -> Decimal:
         """Get total dividends received across all assets."""
-        return sum(
-            sum(amounts) for amounts in self._dividends.values()
-        )
+        return self._total_dividends
 
     def get_total_fees(self) -> Decimal:
         """Get total fees paid."""
@@ -548,19 +769,16 @@ class Portfolio:
             List of dicts with symbol, quantity, cost_basis, proceeds, avg_sell_price, pnl, pnl_percent
         """
         sold_assets = []
-        for symbol, sales in self._sales.items():
-            if not sales:
-                continue
-
-            total_quantity = sum(s["quantity"] for s in sales)
-            total_cost_basis = sum(s["cost_basis"] for s in sales)
-            total_proceeds = sum(s["proceeds"] for s in sales)
+        for symbol, totals in self._sale_totals.items():
+            total_quantity = totals["quantity"]
+            total_cost_basis = totals["cost_basis"]
+            total_proceeds = totals["proceeds"]
 
             if total_quantity > 0:
                 avg_cost = total_cost_basis / total_quantity
                 avg_sell_price = total_proceeds / total_quantity
                 pnl = total_proceeds - total_cost_basis
-                pnl_percent = (pnl / total_cost_basis * 100) if total_cost_basis > 0 else Decimal("0")
+                pnl_percent = (pnl / total_cost_basis * 100) if total_cost_basis > 0 else _D_ZERO
 
                 sold_assets.append({
                     "symbol": symbol,
@@ -587,14 +805,14 @@ class Portfolio:
                 year = str(s["date"].year)
                 entry = by_year.setdefault(
                     year,
-                    {"total": Decimal("0"), "lt": Decimal("0"), "st": Decimal("0")},
+                    {"total": _D_ZERO, "lt": _D_ZERO, "st": _D_ZERO},
                 )
                 entry["total"] += s["proceeds"] - s["cost_basis"]
-                entry["lt"] += s.get("lt_proceeds", Decimal("0")) - s.get(
-                    "lt_cost_basis", Decimal("0")
+                entry["lt"] += s.get("lt_proceeds", _D_ZERO) - s.get(
+                    "lt_cost_basis", _D_ZERO
                 )
-                entry["st"] += s.get("st_proceeds", Decimal("0")) - s.get(
-                    "st_cost_basis", Decimal("0")
+                entry["st"] += s.get("st_proceeds", _D_ZERO) - s.get(
+                    "st_cost_basis", _D_ZERO
                 )
         return {
             year: {k: float(v) for k, v in vals.items()}
@@ -617,10 +835,10 @@ class Portfolio:
             for s in sales:
                 year = str(s["date"].year)
                 gain = s["proceeds"] - s["cost_basis"]
-                lt_gain = s.get("lt_proceeds", Decimal("0")) - s.get("lt_cost_basis", Decimal("0"))
-                st_gain = s.get("st_proceeds", Decimal("0")) - s.get("st_cost_basis", Decimal("0"))
-                has_lt = (s.get("lt_cost_basis", Decimal("0")) or s.get("lt_proceeds", Decimal("0")))
-                has_st = (s.get("st_cost_basis", Decimal("0")) or s.get("st_proceeds", Decimal("0")))
+                lt_gain = s.get("lt_proceeds", _D_ZERO) - s.get("lt_cost_basis", _D_ZERO)
+                st_gain = s.get("st_proceeds", _D_ZERO) - s.get("st_cost_basis", _D_ZERO)
+                has_lt = (s.get("lt_cost_basis", _D_ZERO) or s.get("lt_proceeds", _D_ZERO))
+                has_st = (s.get("st_cost_basis", _D_ZERO) or s.get("st_proceeds", _D_ZERO))
                 term = "LT" if has_lt and not has_st else "ST" if has_st and not has_lt else "Mixed"
                 by_year.setdefault(year, []).append({
                     "symbol": symbol,
@@ -646,31 +864,36 @@ class Portfolio:
         Returns:
             PortfolioSummary object
         """
-        holdings = self.get_holdings(fetch_prices=fetch_prices)
+        holdings, weighted_cagr, price_lookup = self._get_holdings(fetch_prices)
         dividend_summaries = self.get_dividend_summaries()
 
-        # Separate investments from cash for P&L calculations
-        investments = [h for h in holdings if h.symbol != "CASH"]
-        cash_holding = next((h for h in holdings if h.symbol == "CASH"), None)
-
-        # P&L only includes investments, not cash
-        investment_cost_basis = sum(h.cost_basis for h in investments)
-        investment_market_value = sum(
-            h.market_value for h in investments if h.market_value is not None
-        )
-        total_unrealized_pnl = sum(
-            h.unrealized_pnl for h in investments if h.unrealized_pnl is not None
-        )
+        # Separate investments from cash for P&L calculations, accumulating
+        # the investment totals in the same pass (P&L excludes cash).
+        investments = []
+        cash_holding = None
+        investment_cost_basis = _D_ZERO
+        investment_market_value = _D_ZERO
+        total_unrealized_pnl = _D_ZERO
+        for h in holdings:
+            if h.symbol == "CASH":
+                if cash_holding is None:
+                    cash_holding = h
+                continue
+            investments.append(h)
+            investment_cost_basis += h.cost_basis
+            if h.market_value is not None:
+                investment_market_value += h.market_value
+            if h.unrealized_pnl is not None:
+                total_unrealized_pnl += h.unrealized_pnl
 
         # Calculate realized P&L from sold assets
-        total_realized_pnl = Decimal("0")
-        sold_cost_basis = Decimal("0")
-        for symbol, sales in self._sales.items():
-            for sale in sales:
-                total_realized_pnl += sale["proceeds"] - sale["cost_basis"]
-                sold_cost_basis += sale["cost_basis"]
+        total_realized_pnl = _D_ZERO
+        sold_cost_basis = _D_ZERO
+        for totals in self._sale_totals.values():
+            total_realized_pnl += totals["realized_pnl"]
+            sold_cost_basis += totals["cost_basis"]
 
-        # Total dividends
+        # Total dividends (running total kept by _process_transaction)
         total_dividends = self.get_total_dividends()
 
         # All-time cost basis includes current holdings and sold assets
@@ -680,60 +903,25 @@ class Portfolio:
         total_pnl = total_realized_pnl + total_unrealized_pnl
 
         # Total return % based on all-time invested amount
-        total_pnl_percent = Decimal("0")
+        total_pnl_percent = _D_ZERO
         if all_time_cost_basis > 0:
             total_pnl_percent = (total_pnl / all_time_cost_basis) * 100
 
         # Total market value includes cash for overall portfolio value
-        cash_value = cash_holding.market_value if cash_holding and cash_holding.market_value else Decimal("0")
+        cash_value = cash_holding.market_value if cash_holding and cash_holding.market_value else _D_ZERO
         total_market_value = investment_market_value + cash_value
 
-        # Calculate per-lot cost-basis weighted CAGR
-        # This weights each lot's annualized return by its cost basis
+        # Per-lot cost-basis weighted CAGR, computed alongside the holdings
         weighted_annualized_return = None
         if fetch_prices:
-            import math
+            weighted_annualized_return = weighted_cagr
             today = _market_today()
-            weighted_sum = Decimal("0")
-            total_cost_basis_weight = Decimal("0")
-
-            # Build a price lookup from holdings
-            price_lookup = {h.symbol: h.current_price for h in investments if h.current_price}
-
-            for symbol, lots in self._lots.items():
-                if symbol == "CASH":
-                    continue
-
-                current_price = price_lookup.get(symbol)
-                if current_price is None:
-                    continue
 
-                for lot in lots:
-                    if lot.quantity <= 0 or lot.total_cost <= 0:
-                        continue
-
-                    # Calculate holding period
-                    holding_days = (today - lot.purchase_date).days
-                    years = Decimal(str(max(holding_days, 1))) / Decimal("365")
-                    years_for_calc = max(years, Decimal("1"))  # Minimum 1 year to avoid extrapolation
-
-                    # Calculate lot's current value and growth factor
-                    lot_current_value = lot.quantity * current_price
-                    growth_factor = lot_current_value / lot.total_cost
-
-                    # CAGR = growth_factor^(1/years) - 1, as percentage
-                    if growth_factor > 0:
-                        cagr = (Decimal(str(math.pow(float(growth_factor), float(1 / years_for_calc)))) - 1) * 100
-                        weighted_sum += lot.total_cost * cagr
-                        total_cost_basis_weight += lot.total_cost
-
-            if total_cost_basis_weight > 0:
-                weighted_annualized_return = weighted_sum / total_cost_basis_weight
-
-            # Compute LT / ST unrealized P&L from individual lots
+            # Compute LT / ST unrealized P&L from individual lots, priced from
+            # the holdings' lookup (CASH is skipped below)
             one_year_ago = today - timedelta(days=365)
-            lt_unrealized_pnl = Decimal("0")
-            st_unrealized_pnl = Decimal("0")
+            lt_unrealized_pnl = _D_ZERO
+            st_unrealized_pnl = _D_ZERO
             for symbol, lots in self._lots.items():
                 if symbol == "CASH":
                     continue
@@ -785,7 +973,7 @@ class Portfolio:
                 symbols.add(txn.asset)
 
         if not symbols:
-            return Decimal("0"), Decimal("0")
+            return _D_ZERO, _D_ZERO
 
         # Fetch historical prices around target_date (7-day lookback for weekends/holidays)
         fetch_start = target_date - timedelta(days=7)
@@ -796,8 +984,8 @@ class Portfolio:
         )
 
         # Replay transactions up to target_date in a temp portfolio
-        temp = Portfolio(adjust_splits=self._adjust_splits)
-        for txn in sorted(self._transactions, key=lambda t: t.date):
+        temp = self._replay_portfolio()
+        for txn in self._sorted_transactions():
             if txn.date <= target_date:
                 temp._process_transaction(txn)
             else:
@@ -805,16 +993,17 @@ class Portfolio:
 
         # Compute LT/ST unrealized P&L at target_date
         one_year_ago = target_date - timedelta(days=365)
-        lt_pnl = Decimal("0")
-        st_pnl = Decimal("0")
+        lt_pnl = _D_ZERO
+        st_pnl = _D_ZERO
 
         for symbol, lots in temp._lots.items():
+            # Price dicts arrive in date order, so their keys bisect as they are
             prices = historical_prices.get(symbol, {})
-            sorted_keys = sorted(prices.keys())
-            idx = bisect.bisect_right(sorted_keys, target_date) - 1
+            keys = list(prices)
+            idx = bisect.bisect_right(keys, target_date) - 1
             if idx < 0:
                 continue
-            price = prices[sorted_keys[idx]]
+            price = prices[keys[idx]]
 
             for lot in lots:
                 if lot.quantity <= 0:
@@ -877,7 +1066,7 @@ class Portfolio:
         # Get all unique symbols
         symbols = set()
         for txn in self._transactions:
-            if txn.action in (ActionType.BUY, ActionType.SELL, ActionType.GIFT, ActionType.GAS):
+            if txn.action in POSITION_ACTIONS:
                 symbols.add(txn.asset)
 
         # Fetch historical prices for all symbols
@@ -890,40 +1079,40 @@ class Portfolio:
             datetime.combine(end_date, datetime.max.time()),
         )
 
-        # Pre-sort price keys once per symbol for efficient bisect lookups
-        sorted_price_keys = {sym: sorted(prices.keys()) for sym, prices in historical_prices.items()}
+        # Price dicts arrive in date order, so their keys bisect as they are
+        sorted_price_keys = {sym: list(prices) for sym, prices in historical_prices.items()}
 
         # Calculate portfolio value for each date (starting from calc_start)
         calculated_results = []
-        current_date = calc_start
-        # Use same split adjustment setting - quantities will be adjusted at transaction time
-        temp_portfolio = Portfolio(adjust_splits=self._adjust_splits)
-
-        # Sort transactions by date
-        sorted_txns = sorted(self._transactions, key=lambda t: t.date)
 
-        # Fast-forward to transactions before calc_start
-        txn_idx = 0
-        for txn in sorted_txns:
-            if txn.date < calc_start:
-                temp_portfolio._process_transaction(txn)
-                txn_idx += 1
-            else:
-                break
+        # Per-symbol (quantity, cost basis) of the open lots. Lots only change
+        # when a transaction is processed, so totals are re-summed just for
+        # the symbols touched since the previous day.
+        lot_totals: dict[str, tuple[Decimal, Decimal]] = {}
+
+        # A day's value only moves when a transaction lands or some symbol
+        # has a new close; every other day repeats the previous day's row.
+        price_dates = set().union(*sorted_price_keys.values())
+        prev_txn_count = -1
+        prev_row: Optional[dict] = None
+
+        for current_date, temp_portfolio, touched, txn_count in self._replay_daily(calc_start, end_date):
+            if txn_count == prev_txn_count and current_date not in price_dates:
+                if prev_row is not None:
+                    prev_row = {**prev_row, "date": current_date}
+                    calculated_results.append(prev_row)
+                continue
+            prev_txn_count = txn_count
 
-        while current_date <= end_date:
-            # Process transactions up to current date
-            while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date <= current_date:
-                temp_portfolio._process_transaction(sorted_txns[txn_idx])
-                txn_idx += 1
+            for symbol in touched:
+                lot_totals[symbol] = _lot_totals(temp_portfolio._lots.get(symbol, ()))
 
             # Calculate investment value and cost basis (excluding cash)
-            investment_value = Decimal("0")
-            cost_basis = Decimal("0")
-            for symbol, lots in temp_portfolio._lots.items():
+            investment_value = _D_ZERO
+            cost_basis = _D_ZERO
+            for symbol in temp_portfolio._lots:
                 # Quantities are already split-adjusted at transaction time
-                total_quantity = sum(lot.quantity for lot in lots)
-                lot_cost_basis = sum(lot.total_cost for lot in lots)
+                total_quantity, lot_cost_basis = lot_totals[symbol]
                 cost_basis += lot_cost_basis
 
                 if total_quantity > 0 and symbol in historical_prices:
@@ -937,16 +1126,16 @@ class Portfolio:
             cash_balance = temp_portfolio.get_cash_balance(current_date)
             total_value = investment_value + cash_balance
 
-            if total_value > 0 or txn_idx > 0:
-                calculated_results.append({
+            prev_row = None
+            if total_value > 0 or txn_count > 0:
+                prev_row = {
                     "date": current_date,
                     "total_value": total_value,
                     "investment_value": investment_value,
                     "cost_basis": cost_basis,
                     "cash_value": cash_balance,
-                })
-
-            current_date += timedelta(days=1)
+                }
+                calculated_results.append(prev_row)
 
         # Save newly calculated values to cache (only dates > 7 days old)
         if calculated_results:
@@ -994,7 +1183,7 @@ class Portfolio:
 
         symbols = list({
             txn.asset for txn in self._transactions
-            if txn.action in (ActionType.BUY, ActionType.SELL, ActionType.GIFT, ActionType.GAS)
+            if txn.action in POSITION_ACTIONS
         })
 
         fetch_start = start_date - timedelta(days=7)
@@ -1004,36 +1193,35 @@ class Portfolio:
             datetime.combine(today, datetime.max.time()),
         )
 
-        sorted_txns = sorted(self._transactions, key=lambda t: t.date)
-        temp_portfolio = Portfolio(adjust_splits=self._adjust_splits)
+        # Price dicts arrive in date order, so their keys bisect as they are
+        sorted_pbd_keys = {sym: list(prices) for sym, prices in prices_by_date.items()}
 
-        txn_idx = 0
-        for txn in sorted_txns:
-            if txn.date < start_date:
-                temp_portfolio._process_transaction(txn)
-                txn_idx += 1
-            else:
-                break
-
-        # Pre-sort price keys once per symbol for efficient bisect lookups
-        sorted_pbd_keys = {sym: sorted(prices.keys()) for sym, prices in prices_by_date.items()}
+        # Per-symbol (quantity, cost) of the open lots, re-summed only for
+        # symbols whose lots changed since the previous day.
+        lot_totals: dict[str, tuple[Decimal, Decimal]] = {}
 
         daily_values = []
-        current_date = start_date
-        while current_date <= today:
-            while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date <= current_date:
-                temp_portfolio._process_transaction(sorted_txns[txn_idx])
-                txn_idx += 1
-
-            investment_value = Decimal("0")
-            cost_basis = Decimal("0")
+        cumulative_realized = _D_ZERO
+        prev_txn_count = -1
+        for current_date, temp_portfolio, touched, txn_count in self._replay_daily(start_date, today):
+            for symbol in touched:
+                # One pass over the lots; only lots with shares left add cost
+                total_qty = _D_ZERO
+                sym_cost = _D_ZERO
+                for lot in temp_portfolio._lots.get(symbol, ()):
+                    total_qty += lot.quantity
+                    if lot.quantity > 0:
+                        sym_cost += lot.quantity * lot.cost_per_share
+                lot_totals[symbol] = (total_qty, sym_cost)
+
+            investment_value = _D_ZERO
+            cost_basis = _D_ZERO
             symbol_pnl: dict[str, float] = {}
-            for symbol, lots in temp_portfolio._lots.items():
-                total_qty = sum(lot.quantity for lot in lots)
+            for symbol in temp_portfolio._lots:
+                total_qty, sym_cost = lot_totals[symbol]
                 if total_qty <= 0:
                     continue
-                sym_cost = sum(lot.quantity * lot.cost_per_share for lot in lots if lot.quantity > 0)
-                sym_value = Decimal("0")
+                sym_value = _D_ZERO
                 if symbol in prices_by_date:
                     keys = sorted_pbd_keys[symbol]
                     idx = bisect.bisect_right(keys, current_date) - 1
@@ -1045,12 +1233,13 @@ class Portfolio:
 
             unrealized_pnl = investment_value - cost_basis
 
-            # Cumulative realized P&L from all sales processed so far
-            cumulative_realized = sum(
-                s["proceeds"] - s["cost_basis"]
-                for sales in temp_portfolio._sales.values()
-                for s in sales
-            )
+            # Cumulative realized P&L from all sales processed so far; it can
+            # only move on days that processed a transaction.
+            if txn_count != prev_txn_count:
+                prev_txn_count = txn_count
+                cumulative_realized = _D_ZERO
+                for totals in temp_portfolio._sale_totals.values():
+                    cumulative_realized += totals["realized_pnl"]
 
             cash = temp_portfolio.get_cash_balance(current_date)
             daily_values.append({
@@ -1060,7 +1249,15 @@ class Portfolio:
                 "cumulative_realized": float(cumulative_realized),
                 "symbol_pnl": symbol_pnl,
             })
-            current_date += timedelta(days=1)
+
+        # Realized gain per (symbol, sale date), from one pass over the sales
+        # rather than a scan of the symbol's sales for every day and symbol.
+        realized_by_day: dict[tuple[str, str], float] = {}
+        if daily_values:
+            for sym, sales in temp_portfolio._sales.items():
+                for s in sales:
+                    key = (sym, s["date"].isoformat())
+                    realized_by_day[key] = realized_by_day.get(key, 0) + float(s["proceeds"] - s["cost_basis"])
 
         result = []
         for i in range(1, len(daily_values)):
@@ -1081,13 +1278,7 @@ class Portfolio:
             for sym in all_symbols:
                 sym_change = curr["symbol_pnl"].get(sym, 0.0) - prev["symbol_pnl"].get(sym, 0.0)
                 # Add realized gain for this symbol if any sells happened today
-                curr_date_obj = date.fromisoformat(curr["date"])
-                sym_realized = sum(
-                    float(s["proceeds"] - s["cost_basis"])
-                    for s in temp_portfolio._sales.get(sym, [])
-                    if s["date"] == curr_date_obj
-                )
-                sym_change += sym_realized
+                sym_change += realized_by_day.get((sym, curr["date"]), 0)
                 if abs(sym_change) >= 0.01:
                     asset_changes.append({"symbol": sym, "pnl": round(sym_change, 2)})
             asset_changes.sort(key=lambda x: abs(x["pnl"]), reverse=True)
@@ -1127,30 +1318,17 @@ class Portfolio:
         if end_date is None:
             end_date = _market_today()
 
-        # Category classification (matching frontend logic)
-        def get_category(symbol: str) -> str:
-            symbol_to_category = {
-                'BTC-USD': 'Crypto', 'ETH-USD': 'Crypto', 'MSTR': 'Crypto', 'CRCL': 'Crypto', 'IBIT': 'Crypto',
-                'VOO': 'Index', 'QQQM': 'Index', 'QQQ': 'Index', 'BRK-B': 'Index',
-                'CASH': 'Cash',
-            }
-            if symbol in symbol_to_category:
-                return symbol_to_category[symbol]
-            if symbol.endswith('-USD'):
-                return 'Crypto'
-            return 'Individual Stocks'
-
-        # Sort transactions by date
-        sorted_txns = sorted(self._transactions, key=lambda t: t.date)
+        # Transactions in date order
+        sorted_txns = self._sorted_transactions()
 
-        # Group transactions by month and calculate monthly data
-        monthly_data: dict[str, dict] = {}
+        # Group transactions by (year, month) and calculate monthly data
+        monthly_data: dict[tuple[int, int], dict] = {}
 
         for txn in sorted_txns:
             if txn.date < start_date or txn.date > end_date:
                 continue
 
-            month_key = txn.date.strftime("%Y-%m")
+            month_key = (txn.date.year, txn.date.month)
 
             if month_key not in monthly_data:
                 monthly_data[month_key] = {
@@ -1167,33 +1345,50 @@ class Portfolio:
                     monthly_data[month_key]["buys"][txn.asset] = 0
                 monthly_data[month_key]["buys"][txn.asset] += amount
                 # Track by category (BUY only)
-                category = get_category(txn.asset)
+                category = _get_category(txn.asset)
                 if category not in monthly_data[month_key]["by_category"]:
                     monthly_data[month_key]["by_category"][category] = 0
                 monthly_data[month_key]["by_category"][category] += amount
 
         # Calculate cost_basis at end of each month
-        temp_portfolio = Portfolio(adjust_splits=self._adjust_splits)
-        txn_idx = 0
+        temp_portfolio = self._replay_portfolio()
+
+        # Per-symbol cost basis of the open lots, re-summed only for symbols
+        # whose lots changed since the previous month.
+        symbol_costs: dict[str, Decimal] = {}
+        touched: set[str] = set()
+
+        def total_cost_basis() -> Decimal:
+            for symbol in touched:
+                _, symbol_costs[symbol] = _lot_totals(temp_portfolio._lots.get(symbol, ()))
+            touched.clear()
+            total = _D_ZERO
+            for symbol in temp_portfolio._lots:
+                total += symbol_costs[symbol]
+            return total
+
+        # Transaction dates, for bisecting each month's slice of sorted_txns
+        txn_dates = [t.date for t in sorted_txns]
+
+        def replay_slice(lo: int, hi: int) -> None:
+            for txn in sorted_txns[lo:hi]:
+                temp_portfolio._process_transaction(txn)
+                touched.add(txn.asset)
 
         # First, process all transactions BEFORE start_date to get initial cost_basis
-        while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date < start_date:
-            temp_portfolio._process_transaction(sorted_txns[txn_idx])
-            txn_idx += 1
+        txn_idx = bisect.bisect_left(txn_dates, start_date)
+        replay_slice(0, txn_idx)
 
         # Calculate initial cost_basis (from before the selected period)
-        prev_cost_basis = Decimal("0")
-        for symbol, lots in temp_portfolio._lots.items():
-            lot_cost_basis = sum(lot.total_cost for lot in lots)
-            prev_cost_basis += lot_cost_basis
+        prev_cost_basis = total_cost_basis()
 
         # Get all months in order
         all_months = sorted(monthly_data.keys())
 
         results = []
         for month_key in all_months:
-            # Parse month to get the last day
-            year, month = map(int, month_key.split("-"))
+            # Last day of the month
+            year, month = month_key
             if month == 12:
                 next_month_start = date(year + 1, 1, 1)
             else:
@@ -1201,15 +1396,12 @@ class Portfolio:
             month_end = next_month_start - timedelta(days=1)
 
             # Process all transactions up to end of month
-            while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date <= month_end:
-                temp_portfolio._process_transaction(sorted_txns[txn_idx])
-                txn_idx += 1
+            end_idx = bisect.bisect_right(txn_dates, month_end, lo=txn_idx)
+            replay_slice(txn_idx, end_idx)
+            txn_idx = end_idx
 
             # Calculate total cost basis
-            cost_basis = Decimal("0")
-            for symbol, lots in temp_portfolio._lots.items():
-                lot_cost_basis = sum(lot.total_cost for lot in lots)
-                cost_basis += lot_cost_basis
+            cost_basis = total_cost_basis()
 
             # Calculate net investment for this month only
             net_investment = cost_basis - prev_cost_basis
@@ -1230,7 +1422,7 @@ class Portfolio:
             )
 
             results.append({
-                "month": month_key,
+                "month": f"{year:04d}-{month:02d}",
                 "cost_basis": float(cost_basis),
                 "net_investment": float(net_investment),
                 "transactions": tx_details,
@@ -1264,25 +1456,30 @@ class Portfolio:
         # Get symbols and their quantities
         symbols = [h.symbol for h in investment_holdings]
         quantities = {h.symbol: h.quantity for h in investment_holdings}
-        cost_basis = sum(h.cost_basis for h in investment_holdings)
-
-        logger.info(f"Intraday: Symbols={symbols}, Cost basis={cost_basis}")
 
-        # Get previous close prices for pre-market baseline
-        prev_close_prices = price_service.get_previous_close_batch(symbols)
+        logger.info(f"Intraday: Symbols={symbols}")
+
+        # The previous closes (pre-market baseline), intraday bars and
+        # real-time prices are independent yfinance requests, so they are
+        # fetched concurrently. (yf.download only keeps its results per call
+        # from yfinance 1.4; earlier releases share one global buffer.)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            prev_close_future = pool.submit(price_service.get_previous_close_batch, symbols)
+            intraday_future = pool.submit(price_service.get_intraday_prices_batch, symbols, interval)
+            realtime_future = pool.submit(price_service.get_prices_batch, symbols)
+            prev_close_prices = prev_close_future.result()
+            intraday_prices = intraday_future.result()
+            current_realtime_prices = realtime_future.result()
         logger.info(f"Intraday: Previous close prices: {prev_close_prices}")
 
         # Calculate baseline value using previous close
-        baseline_value = Decimal("0")
+        baseline_value = _D_ZERO
         for symbol in symbols:
             if symbol in prev_close_prices and prev_close_prices[symbol] is not None:
                 baseline_value += quantities[symbol] * prev_close_prices[symbol]
 
         logger.info(f"Intraday: Baseline value (prev close): {baseline_value}")
 
-        # Fetch intraday prices for all symbols
-        intraday_prices = price_service.get_intraday_prices_batch(symbols, interval)
-
         # Find all timestamps from intraday data
         all_times = set()
         for symbol, prices in intraday_prices.items():
@@ -1311,12 +1508,16 @@ class Portfolio:
             if interval.endswith("m"):
                 interval_minutes = int(interval[:-1])
 
-            # Add points from 16:00 to current time
-            for hour in range(16, 24):
-                for minute in range(0, 60, interval_minutes):
-                    time_str = f"{hour:02d}:{minute:02d}"
-                    if time_str <= current_time:
-                        all_times.add(time_str)
+            # Add points from 16:00 to current time, comparing minutes of the
+            # day and stopping at the current hour
+            now_minutes = current_hour * 60 + current_minute
+            slot_minutes = range(0, 60, interval_minutes)
+            for hour in range(16, min(current_hour, 23) + 1):
+                all_times.update(
+                    f"{hour:02d}:{minute:02d}"
+                    for minute in slot_minutes
+                    if hour * 60 + minute <= now_minutes
+                )
 
             # Add current time as final point
             all_times.add(current_time)
@@ -1329,10 +1530,14 @@ class Portfolio:
         # Sort times chronologically
         sorted_times = sorted(all_times)
 
-        # Get real-time current prices (same as holdings table uses)
-        current_realtime_prices = price_service.get_prices_batch(symbols)
+        # Real-time current prices (same as holdings table uses)
         logger.info(f"Intraday: Real-time prices: {current_realtime_prices}")
 
+        # Build price lookup: {symbol: {time: price}}
+        price_lookup = {}
+        for symbol, prices in intraday_prices.items():
+            price_lookup[symbol] = {p["time"]: p["price"] for p in prices}
+
         # Calculate portfolio value at each time point
         results = []
         # Track last known price for each symbol (initialize with previous close)
@@ -1352,12 +1557,13 @@ class Portfolio:
             # Check if this is the last valid time point
             is_last_time_point = (idx == len(sorted_times) - 1) or (sorted_times[idx + 1] > current_time if idx + 1 < len(sorted_times) else True)
 
-            total_value = Decimal("0")
+            total_value = _D_ZERO
             has_data = False
 
             for symbol in symbols:
                 price_at_time = None
-                has_intraday_data = len(intraday_prices.get(symbol, [])) > 0
+                symbol_prices = price_lookup.get(symbol, {})
+                has_intraday_data = len(symbol_prices) > 0
 
                 # For the last time point, use real-time prices to match holdings table
                 # But only for symbols that have intraday data today (i.e., trading today)
@@ -1366,12 +1572,9 @@ class Portfolio:
                     last_prices[symbol] = price_at_time
                 else:
                     # Check if we have intraday data for this time
-                    symbol_prices = intraday_prices.get(symbol, [])
-                    for p in symbol_prices:
-                        if p["time"] == time_str:
-                            price_at_time = p["price"]
-                            last_prices[symbol] = price_at_time
-                            break
+                    price_at_time = symbol_prices.get(time_str)
+                    if price_at_time is not None:
+                        last_prices[symbol] = price_at_time
 
                 # Use last known price (starts with previous close)
                 if price_at_time is None:
@@ -1384,7 +1587,7 @@ class Portfolio:
             if has_data and total_value > 0:
                 # Daily P&L: change from midnight (previous close)
                 daily_pnl = total_value - zero_point_value
-                daily_pnl_percent = (daily_pnl / zero_point_value * 100) if zero_point_value > 0 else Decimal("0")
+                daily_pnl_percent = (daily_pnl / zero_point_value * 100) if zero_point_value > 0 else _D_ZERO
 
                 # Calculate per-asset P&L changes using previous close (same as holdings table)
                 asset_changes = []
@@ -1434,8 +1637,8 @@ class Portfolio:
             return []
 
         # Replay transactions to get holdings as of target_date
-        sorted_txns = sorted(self._transactions, key=lambda t: t.date)
-        temp_portfolio = Portfolio(adjust_splits=self._adjust_splits)
+        sorted_txns = self._sorted_transactions()
+        temp_portfolio = self._replay_portfolio()
         for txn in sorted_txns:
             if txn.date <= target_date:
                 temp_portfolio._process_transaction(txn)
@@ -1457,9 +1660,10 @@ class Portfolio:
         )
         for symbol in symbols:
             hist = hist_batch.get(symbol) or {}
-            keys = sorted(k for k in hist.keys() if k < target_date)
-            if keys:
-                prev_close_prices[symbol] = hist[keys[-1]]
+            keys = list(hist)
+            idx = bisect.bisect_left(keys, target_date) - 1
+            if idx >= 0:
+                prev_close_prices[symbol] = hist[keys[idx]]
 
         baseline_value = sum(
             quantities[s] * prev_close_prices[s]
@@ -1487,22 +1691,23 @@ class Portfolio:
             return []
 
         sorted_times = sorted(all_times)
+        price_lookup = {
+            symbol: {p["time"]: p["price"] for p in prices}
+            for symbol, prices in intraday_prices.items()
+        }
         results = []
         last_prices = {s: prev_close_prices.get(s) for s in symbols}
         zero_point_value = baseline_value
 
         for time_str in sorted_times:
-            total_value = Decimal("0")
+            total_value = _D_ZERO
             has_data = False
 
             for symbol in symbols:
-                price_at_time = None
-                for p in intraday_prices.get(symbol, []):
-                    if p["time"] == time_str:
-                        price_at_time = p["price"]
-                        last_prices[symbol] = price_at_time
-                        break
-                if price_at_time is None:
+                price_at_time = price_lookup.get(symbol, {}).get(time_str)
+                if price_at_time is not None:
+                    last_prices[symbol] = price_at_time
+                else:
                     price_at_time = last_prices.get(symbol)
                 if price_at_time is not None:
                     total_value += quantities[symbol] * price_at_time
@@ -1510,7 +1715,7 @@ class Portfolio:
 
             if has_data and total_value > 0:
                 daily_pnl = total_value - zero_point_value
-                daily_pnl_percent = (daily_pnl / zero_point_value * 100) if zero_point_value > 0 else Decimal("0")
+                daily_pnl_percent = (daily_pnl / zero_point_value * 100) if zero_point_value > 0 else _D_ZERO
 
                 asset_changes = []
                 for symbol in symbols:
@@ -1560,37 +1765,23 @@ class Portfolio:
         start_date = today - timedelta(days=days)
 
         # --- Replay transactions to build per-day quantities ---
-        sorted_txns = sorted(self._transactions, key=lambda t: t.date)
-        temp_portfolio = Portfolio(adjust_splits=self._adjust_splits)
-
-        txn_idx = 0
-        # Fast-forward to start_date
-        for txn in sorted_txns:
-            if txn.date < start_date:
-                temp_portfolio._process_transaction(txn)
-                txn_idx += 1
-            else:
-                break
-
         # Build daily_quantities: date_str -> {symbol: quantity}
         all_symbols: set[str] = set()
         daily_quantities: dict[str, dict[str, Decimal]] = {}
+        # Symbol -> open quantity, re-summed only when its lots change
+        open_qty: dict[str, Decimal] = {}
 
-        current_date = start_date
-        while current_date <= today:
-            # Process transactions on or before current_date
-            while txn_idx < len(sorted_txns) and sorted_txns[txn_idx].date <= current_date:
-                temp_portfolio._process_transaction(sorted_txns[txn_idx])
-                txn_idx += 1
+        for current_date, temp_portfolio, touched, _ in self._replay_daily(start_date, today):
+            for symbol in touched:
+                open_qty[symbol], _ = _lot_totals(temp_portfolio._lots.get(symbol, ()))
 
             day_qty: dict[str, Decimal] = {}
-            for symbol, lots in temp_portfolio._lots.items():
-                total_qty = sum(lot.quantity for lot in lots)
+            for symbol in temp_portfolio._lots:
+                total_qty = open_qty[symbol]
                 if total_qty > 0:
                     day_qty[symbol] = total_qty
                     all_symbols.add(symbol)
             daily_quantities[current_date.isoformat()] = day_qty
-            current_date += timedelta(days=1)
 
         symbols = sorted(all_symbols)
         logger.info(f"Multi-day intraday: Found {len(symbols)} symbols across period")
@@ -1635,11 +1826,11 @@ class Portfolio:
             ts_date = dt.strftime("%Y-%m-%d")
             quantities = daily_quantities.get(ts_date, {})
 
-            total_value = Decimal("0")
+            total_value = _D_ZERO
             has_data = False
 
             for symbol in symbols:
-                qty = quantities.get(symbol, Decimal("0"))
+                qty = quantities.get(symbol, _D_ZERO)
                 if qty <= 0:
                     continue
 
@@ -28,6 +28,29 @@ def _to_market_naive(ts: datetime) -> datetime:
     return ts.astimezone(MARKET_TZ).replace(tzinfo=None)
 
 
+def _closes_by_date(close_series) -> dict[date, Decimal]:
+    """Map each bar's (market-local) date to its close as a Decimal.
+
+    Pulls the column out with one ``tolist()`` so the per-value work is a
+    plain float -> str -> Decimal, rather than boxing numpy scalars or building
+    a Series per row as ``iterrows()`` does.
+    """
+    return {
+        d: Decimal(str(price))
+        for d, price in zip(close_series.index.date, close_series.tolist())
+    }
+
+
+def _by_date(prices: dict[date, Decimal]) -> dict[date, Decimal]:
+    """Return ``prices`` re-keyed in ascending date order.
+
+    Historical price dicts are merged from the persistent cache (unordered
+    query) and fresh yfinance bars, so they are sorted once here, before
+    being cached, and callers can bisect ``list(prices)`` without sorting.
+    """
+    return dict(sorted(prices.items()))
+
+
 def _yf_call_with_retry(fn, *args, **kwargs):
     """Invoke a yfinance call, retrying on 429 / 'Too Many Requests' with backoff."""
     delays = (1, 2, 4)
@@ -136,7 +159,8 @@ class PriceService:
                 interval="1m",
                 prepost=True,
                 progress=False,
-                group_by="ticker" if len(uncached_symbols) > 1 else None
+                group_by="ticker" if len(uncached_symbols) > 1 else None,
+                multi_level_index=False,
             )
 
             for symbol in uncached_symbols:
@@ -170,13 +194,61 @@ class PriceService:
         except Exception as e:
             logger.error(f"Error in batch price fetch: {e}")
 
-        # Fall back to individual fetching for any missing symbols
-        for symbol in uncached_symbols:
-            if symbol not in results or results[symbol] is None:
-                results[symbol] = self.get_current_price(symbol)
+        # Symbols with no 1m bars (e.g. outside trading days) fall back to the
+        # last daily close, fetched for all of them in one request. Anything
+        # that request doesn't resolve goes symbol by symbol.
+        missing = [s for s in uncached_symbols if results.get(s) is None]
+        if missing:
+            closes = self._get_last_daily_close_batch(missing) or {}
+            for symbol in missing:
+                price = closes.get(symbol)
+                if price is not None:
+                    self._price_cache[symbol] = (price, datetime.now())
+                    results[symbol] = price
+                else:
+                    results[symbol] = self.get_current_price(symbol)
 
         return results
 
+    def _get_last_daily_close_batch(
+        self, symbols: list[str]
+    ) -> Optional[dict[str, Optional[Decimal]]]:
+        """Return each symbol's latest daily close from one 5-day yf.download().
+
+        Returns None if the download itself fails.
+        """
+        try:
+            data = yf.download(
+                symbols,
+                period="5d",
+                progress=False,
+                group_by="ticker" if len(symbols) > 1 else None,
+                multi_level_index=False,
+            )
+        except Exception as e:
+            logger.error(f"Error in batch daily close fetch: {e}")
+            return None
+
+        results: dict[str, Optional[Decimal]] = {}
+        for symbol in symbols:
+            try:
+                if len(symbols) == 1:
+                    symbol_data = data
+                elif symbol in data.columns.get_level_values(0):
+                    symbol_data = data[symbol]
+                else:
+                    results[symbol] = None
+                    continue
+                closes = symbol_data["Close"].dropna() if not symbol_data.empty else None
+                if closes is None or closes.empty:
+                    results[symbol] = None
+                else:
+                    results[symbol] = Decimal(str(closes.iloc[-1]))
+            except Exception as e:
+                logger.error(f"Error processing daily close for {symbol}: {e}")
+                results[symbol] = None
+        return results
+
     def get_historical_prices(
         self,
         symbol: str,
@@ -191,7 +263,7 @@ class PriceService:
             end_date: End date (defaults to today)
 
         Returns:
-            Dictionary mapping dates to closing prices
+            Dictionary mapping dates to closing prices, in ascending date order
         """
         if end_date is None:
             end_date = datetime.now()
@@ -234,18 +306,14 @@ class PriceService:
                 end=end_d + timedelta(days=1),
             )
 
-            fetched_prices = {}
-            for date_idx, row in history.iterrows():
-                # Convert pandas Timestamp to datetime.date
-                date_key = date_idx.to_pydatetime().date()
-                fetched_prices[date_key] = Decimal(str(row["Close"]))
+            fetched_prices = _closes_by_date(history["Close"])
 
             # Save newly fetched prices to persistent cache (only dates > 7 days old)
             if fetched_prices:
                 cache_service.save_historical_prices_batch(symbol, fetched_prices)
 
             # Merge cached and fetched prices
-            all_prices = {**cached_prices, **fetched_prices}
+            all_prices = _by_date({**cached_prices, **fetched_prices})
 
             # Update memory cache
             self._history_cache[cache_key] = (all_prices, datetime.now())
@@ -255,7 +323,7 @@ class PriceService:
         except Exception as e:
             logger.error(f"Error fetching historical prices for {symbol}: {e}")
             # Return cached data if available, even on error
-            return cached_prices if cached_prices else {}
+            return _by_date(cached_prices) if cached_prices else {}
 
     def get_historical_prices_batch(
         self,
@@ -270,7 +338,8 @@ class PriceService:
         symbols are needed for one /api/performance request.
 
         Honors both the persistent cache_service (for dates > cutoff) and the
-        in-memory _history_cache (5-min TTL).
+        in-memory _history_cache (5-min TTL). Each symbol's prices come back in
+        ascending date order, as from get_historical_prices.
         """
         if not symbols:
             return {}
@@ -284,6 +353,7 @@ class PriceService:
         results: dict[str, dict[date, Decimal]] = {}
         need_fetch: dict[str, date] = {}  # symbol -> earliest date to fetch
 
+        uncached: list[str] = []
         for symbol in symbols:
             cache_key = f"{symbol}_{start_d}_{end_d}"
             if cache_key in self._history_cache:
@@ -291,9 +361,13 @@ class PriceService:
                 if datetime.now() - cached_at < self.cache_ttl:
                     results[symbol] = data
                     continue
+            uncached.append(symbol)
 
-            cached_prices = cache_service.get_historical_prices(symbol, start_d, end_d)
-            results[symbol] = dict(cached_prices)
+        # One query for every symbol missing from the in-memory cache.
+        persisted = cache_service.get_historical_prices_multi(uncached, start_d, end_d)
+        for symbol in uncached:
+            cached_prices = persisted.get(symbol, {})
+            results[symbol] = cached_prices
 
             if cached_prices:
                 earliest_cached = min(cached_prices.keys())
@@ -323,6 +397,7 @@ class PriceService:
                         end=(end_d + timedelta(days=1)).isoformat(),
                         progress=False,
                         group_by="ticker" if len(group) > 1 else None,
+                        multi_level_index=False,
                     )
                 except Exception as e:
                     logger.error(f"Error in batch historical fetch for {group}: {e}")
@@ -340,10 +415,7 @@ class PriceService:
                         if sd is None or sd.empty:
                             continue
 
-                        fetched: dict[date, Decimal] = {}
-                        for ts, price in sd["Close"].dropna().items():
-                            d = ts.date() if hasattr(ts, "date") else ts
-                            fetched[d] = Decimal(str(price))
+                        fetched = _closes_by_date(sd["Close"].dropna())
 
                         if fetched:
                             cache_service.save_historical_prices_batch(symbol, fetched)
@@ -351,6 +423,9 @@ class PriceService:
                     except Exception as e:
                         logger.error(f"Error processing batch historical data for {symbol}: {e}")
 
+        for symbol in uncached:
+            results[symbol] = _by_date(results[symbol])
+
         now = datetime.now()
         for symbol in symbols:
             cache_key = f"{symbol}_{start_d}_{end_d}"
@@ -500,9 +575,7 @@ class PriceService:
                         )
                         if sd is None or sd.empty:
                             continue
-                        for ts, price in sd["Close"].dropna().items():
-                            d = ts.date() if hasattr(ts, "date") else ts
-                            results[symbol][d] = Decimal(str(price))
+                        results[symbol].update(_closes_by_date(sd["Close"].dropna()))
                     except Exception as e:
                         logger.error(f"Error processing daily close for {symbol}: {e}")
             except Exception as e:
@@ -7,34 +7,25 @@ returns the same ``Transaction`` objects the CSV loader used to produce, so
 
 from typing import Optional
 
+from psycopg.rows import dict_row
+
 from .db import get_pool
-from .models import ActionType, Transaction
+from .models import Transaction, transaction_adapter
 
 
 def get_all_transactions() -> list[Transaction]:
     """Load every transaction from the DB as Transaction objects, sorted by date."""
+    # Rows come back as dicts keyed by column name, which match the
+    # Transaction fields, so each one is validated directly.
+    validate = transaction_adapter.validate_python
     with get_pool().connection() as conn:
-        rows = conn.execute(
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(
             """SELECT date, asset, action, amount, quantity, ave_price, source, comment
                FROM transactions
                ORDER BY date, id"""
-        ).fetchall()
-
-    transactions: list[Transaction] = []
-    for r in rows:
-        transactions.append(
-            Transaction(
-                date=r[0],
-                asset=r[1],
-                action=ActionType(r[2]),
-                amount=r[3],
-                quantity=r[4],
-                ave_price=r[5],
-                source=r[6],
-                comment=r[7],
-            )
         )
-    return transactions
+        return [validate(row) for row in cur]
 
 
 def get_all_transactions_with_meta() -> list[dict]:
@@ -281,13 +281,12 @@ def run_simulation(
         fetch_symbols, start_date, end_date,
         initial_capital, dca_frequency, dca_amount, rebalance_frequency,
     )
-    historical_prices: dict[str, dict] = {}
-    for sym in fetch_symbols:
-        historical_prices[sym] = price_service.get_historical_prices(
-            sym,
-            datetime.combine(start_date - timedelta(days=14), datetime.min.time()),
-            datetime.combine(end_date + timedelta(days=2), datetime.max.time()),
-        )
+    # One batched download (and one cache query) for all symbols
+    historical_prices: dict[str, dict] = price_service.get_historical_prices_batch(
+        fetch_symbols,
+        datetime.combine(start_date - timedelta(days=14), datetime.min.time()),
+        datetime.combine(end_date + timedelta(days=2), datetime.max.time()),
+    )
 
     # ---- build sampling / DCA / rebalance calendars -----------------------
     sample_dates: list[date] = []
@@ -1,14 +1,18 @@
 """Stock split service for fetching and applying split adjustments."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Iterable, Optional
 
 import yfinance as yf
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent yfinance split lookups in get_splits_for_symbols.
+_MAX_FETCH_WORKERS = 8
+
 
 class SplitService:
     """Service for fetching and caching stock split data."""
@@ -88,6 +92,37 @@ class SplitService:
 
         return factor
 
+    def get_adjustment_factors(
+        self,
+        symbol: str,
+        transaction_dates: Iterable[date],
+        target_date: Optional[date] = None
+    ) -> dict[date, Decimal]:
+        """Calculate get_adjustment_factor for several dates of one symbol.
+
+        The symbol's splits are looked up once for all dates.
+
+        Args:
+            symbol: Yahoo Finance ticker symbol
+            transaction_dates: Dates of the original transactions
+            target_date: Date to adjust to (defaults to today)
+
+        Returns:
+            Dictionary mapping each transaction date to its cumulative split factor
+        """
+        if target_date is None:
+            target_date = date.today()
+
+        splits = self.get_splits(symbol)
+        factors = {}
+        for transaction_date in transaction_dates:
+            factor = Decimal("1")
+            for split_date, ratio in splits.items():
+                if transaction_date < split_date <= target_date:
+                    factor *= ratio
+            factors[transaction_date] = factor
+        return factors
+
     def adjust_quantity(
         self,
         symbol: str,
@@ -139,16 +174,21 @@ class SplitService:
     def get_splits_for_symbols(self, symbols: list[str]) -> dict[str, dict[date, Decimal]]:
         """Get splits for multiple symbols (batch operation).
 
+        Each uncached symbol is a separate yfinance request, so the lookups
+        run on a small thread pool instead of one after another.
+
         Args:
             symbols: List of Yahoo Finance ticker symbols
 
         Returns:
             Dictionary mapping symbols to their splits
         """
-        result = {}
-        for symbol in symbols:
-            result[symbol] = self.get_splits(symbol)
-        return result
+        unique = list(dict.fromkeys(symbols))
+        if len(unique) <= 1:
+            return {symbol: self.get_splits(symbol) for symbol in unique}
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self.get_splits, unique)))
 
 
 # Global split service instance
@@ -29,6 +29,9 @@ CREATE TABLE IF NOT EXISTS targets (
 
 -- ---------------------------------------------------------------------------
 -- Persistent price/value cache (replaces data/cache.db). Wired up in phase 3.
+-- Dates are native DATE: stored as a fixed-width 4-byte day number, so the
+-- (symbol, date) keys compare numerically — no ISO-text parsing or ordinal
+-- encoding needed (that was only a concern for the old SQLite TEXT columns).
 -- ---------------------------------------------------------------------------
 
 CREATE TABLE IF NOT EXISTS historical_prices (
@@ -38,8 +41,11 @@ CREATE TABLE IF NOT EXISTS historical_prices (
     created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
     PRIMARY KEY (symbol, date)
 );
-CREATE INDEX IF NOT EXISTS idx_historical_prices_symbol ON historical_prices (symbol);
-CREATE INDEX IF NOT EXISTS idx_historical_prices_date   ON historical_prices (date);
+-- Range lookups ("symbol = ? AND date BETWEEN ? AND ?") are served by the
+-- primary key, whose leading column is symbol, so a separate symbol index only
+-- adds write cost. The date index stays for the MIN/MAX(date) cache stats.
+DROP INDEX IF EXISTS idx_historical_prices_symbol;
+CREATE INDEX IF NOT EXISTS idx_historical_prices_date ON historical_prices (date);
 
 CREATE TABLE IF NOT EXISTS portfolio_values (
     date             DATE PRIMARY KEY,
@@ -23,7 +23,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app import db, repository  # noqa: E402
-from app.csv_parser import CSVParseError, parse_csv_file  # noqa: E402
+from app.csv_parser import CSVParseError, parse_csv_files  # noqa: E402
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 TARGETS_FILE = DATA_DIR / "targets.json"
@@ -60,13 +60,13 @@ def migrate(reset: bool) -> None:
     total_parsed = 0
     failures: list[str] = []
 
-    for csv_file in csv_files:
+    # Files are parsed in parallel (CPU-bound) but come back in file order,
+    # so the per-file report and row ids match a sequential run.
+    for csv_file, txns in parse_csv_files(csv_files):
         rel = csv_file.relative_to(DATA_DIR)
         broker = _broker_for(csv_file)
-        try:
-            txns = parse_csv_file(csv_file)
-        except CSVParseError as e:
-            failures.append(f"{rel}: {e}")
+        if isinstance(txns, CSVParseError):
+            failures.append(f"{rel}: {txns}")
             continue
         repository.insert_transactions(txns, broker=broker)
         total_parsed += len(txns)
@@ -0,0 +1,49 @@
+"""Tests for the portfolio simulator."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app import price_service as price_service_module
+from app.cache_service import cache_service
+from app.price_service import price_service
+from app.simulator import run_simulation
+
+
+def _fake_download(tickers, start, end, group_by=None, multi_level_index=True, **kwargs):
+    """Mimic yf.download's column layout for a flat price series.
+
+    yfinance 1.x keeps a (field, ticker) MultiIndex for a single ticker unless
+    multi_level_index=False is passed.
+    """
+    tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+    index = pd.date_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), freq="D")
+    frames = {t: pd.DataFrame({"Close": [100.0] * len(index)}, index=index) for t in tickers}
+    if len(tickers) == 1 and not multi_level_index:
+        return frames[tickers[0]]
+    if group_by == "ticker":
+        return pd.concat(frames, axis=1)
+    return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+
+
+@pytest.fixture
+def offline_prices(monkeypatch):
+    monkeypatch.setattr(price_service_module.yf, "download", _fake_download)
+    monkeypatch.setattr(cache_service, "get_historical_prices_multi", lambda *a: {})
+    monkeypatch.setattr(cache_service, "save_historical_prices_batch", lambda *a: 0)
+    price_service.clear_cache()
+
+
+def test_single_symbol_simulation_without_benchmark(offline_prices):
+    result = run_simulation(
+        allocations=[{"symbol": "VOO", "weight": 100}],
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 3, 1),
+        initial_capital=1000.0,
+        benchmark=None,
+    )
+
+    assert result["data_points"]
+    assert all(p["value"] == 1000.0 for p in result["data_points"])
+    assert result["metrics"]["final_value"] == 1000.0